@@ -1,5 +1,6 @@
 # lexer.py
 import re
+import sys
 from modules.sql_compiler.rule.rules import KEYWORDS
 from modules.sql_compiler.lexical.my_token import Token
 
@@ -43,8 +44,8 @@ class Lexer:
             self.column += 1
         return char
 
-    def add_token(self, type_, lexeme, line, column):
-        self.tokens.append(Token(type_, lexeme, line, column))
+    def add_token(self, type_, lexeme, line, column, lexeme_upper=None):
+        self.tokens.append(Token(type_, lexeme, line, column, lexeme_upper))
 
     def add_error(self, error_type, lexeme, line, column):
         error = [error_type, lexeme, line, column]
@@ -84,8 +85,16 @@ class Lexer:
             self.add_error(ERROR_TYPES["INVALID_IDENTIFIER"], lexeme, self.line, start_col)
             return
 
-        type_ = "KEYWORD" if lexeme.upper() in KEYWORDS else "IDENTIFIER"
-        self.add_token(type_, lexeme, self.line, start_col)
+        lexeme_upper = lexeme.upper()
+        if lexeme_upper in KEYWORDS:
+            type_ = "KEYWORD"
+            # 关键字的大写形式驻留后，解析器中与关键字常量的比较可直接按身份命中
+            lexeme_upper = sys.intern(lexeme_upper)
+        else:
+            # 标识符（表名、列名）驻留：与目录中同样驻留的键是同一对象，字典查找可直接按身份命中
+            type_ = "IDENTIFIER"
+            lexeme = sys.intern(lexeme)
+        self.add_token(type_, lexeme, self.line, start_col, lexeme_upper)
 
     def lex_number(self):
         start_col = self.column
@@ -101,7 +110,8 @@ class Lexer:
             self.add_error(ERROR_TYPES["INVALID_NUMBER"], lexeme, self.line, start_col)
             return
 
-        self.add_token("CONST", lexeme, self.line, start_col)
+        # 数字没有大小写之分，词素本身就是大写形式
+        self.add_token("CONST", lexeme, self.line, start_col, lexeme)
 
     def lex_string(self):
         start_col = self.column
@@ -119,6 +129,7 @@ class Lexer:
         self.add_token("CONST", lexeme, self.line, start_col)
 
     def lex_operator_or_delimiter(self):
+        # 运算符和分隔符不含字母，词素本身就是大写形式，不必再调用 .upper()
         start_col = self.column
         char = self.advance()
         if char in "=<>":
@@ -128,17 +139,17 @@ class Lexer:
                 char += self.advance()  # 支持 <> (不等于)
             elif char == '!' and self.peek() == '=':
                 char += self.advance()  # 支持 != (不等于)
-            self.add_token("OPERATOR", char, self.line, start_col)
+            self.add_token("OPERATOR", char, self.line, start_col, char)
         elif char in "+-*/%":
-            self.add_token("OPERATOR", char, self.line, start_col)
+            self.add_token("OPERATOR", char, self.line, start_col, char)
         elif char == '!' and self.peek() == '=':
             char += self.advance()  # 处理 != 操作符
-            self.add_token("OPERATOR", char, self.line, start_col)
+            self.add_token("OPERATOR", char, self.line, start_col, char)
         elif char in "(),;.*":
-            self.add_token("DELIMITER", char, self.line, start_col)
+            self.add_token("DELIMITER", char, self.line, start_col, char)
         elif char in "$@#%&":
             # 支持常见的自定义分隔符字符
-            self.add_token("DELIMITER", char, self.line, start_col)
+            self.add_token("DELIMITER", char, self.line, start_col, char)
         else:
             self.add_error(ERROR_TYPES["UNKNOWN_SYMBOL"], char, self.line, start_col)
 
@@ -1,8 +1,12 @@
 # my_token.py
 class Token:
-    def __init__(self, type_, lexeme, line, column):
+    def __init__(self, type_, lexeme, line, column, lexeme_upper=None):
         self.type = type_      # 种别码：KEYWORD, IDENTIFIER, CONST, OPERATOR, DELIMITER
         self.lexeme = lexeme   # 词素值
+        # 大写词素：解析器做关键字比较时直接使用，不必每次调用 .upper()。
+        # 词法分析器为关键字/标识符（判断关键字时已算出）和不含字母的词素直接给出，
+        # 只有未给出时（如字符串常量）才在这里计算
+        self.lexeme_upper = lexeme.upper() if lexeme_upper is None else lexeme_upper
         self.line = line       # 行号
         self.column = column   # 列号
 
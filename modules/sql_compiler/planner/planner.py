@@ -223,7 +223,7 @@ class Planner:
                 if child.get("type") == "TIMING":
                     timing = child.get("value", "")
                 elif child.get("type") == "EVENTS":
-                    events = child.get("value", "").split(",") if child.get("value") else []
+                    events = list(child.get("value") or ())
                 elif child.get("type") == "TABLE":
                     table_name = child.get("value", "")
                 elif child.get("type") == "FOR_EACH_ROW":
@@ -1,4 +1,9 @@
 # semantic.py
+import logging
+import re
+import sys
+import weakref
+from collections import ChainMap, namedtuple
 
 # 尝试导入智能诊断模块
 try:
@@ -13,57 +18,278 @@ try:
 except ImportError:
     # 如果无法导入，创建一个简单的替代类
     class ASTNode:
+        __slots__ = ("node_type", "value", "children")
+
         def __init__(self, node_type, value=None, children=None):
-            self.node_type = node_type
+            self.node_type = sys.intern(node_type.upper())
             self.value = value
             self.children = children or []
 
+logger = logging.getLogger(__name__)
+
+_EMPTY_SET = frozenset()
+_EMPTY_DICT = {}  # 只读的空映射，不要修改
+_MISSING = object()  # dict.get 的哨兵值，用于把“判断存在 + 取值”合并为一次查找
+
+# 高频子节点类型常量。ASTNode 构造时已对 node_type 做 sys.intern，
+# 与这些驻留字符串比较可直接用 is（指针比较）
+_COLUMN = sys.intern("COLUMN")
+_VALUE = sys.intern("VALUE")
+_WHERE = sys.intern("WHERE")
+_LEFT = sys.intern("LEFT")
+_RIGHT = sys.intern("RIGHT")
+_AGGREGATE = sys.intern("AGGREGATE")
+_SORT = sys.intern("SORT")
+_ASSIGNMENT = sys.intern("ASSIGNMENT")
+_COMPARISON = sys.intern("COMPARISON")
+_LOGICAL_OP = sys.intern("LOGICAL_OP")
+_BETWEEN = sys.intern("BETWEEN")
+_IN = sys.intern("IN")
+_LIKE = sys.intern("LIKE")
+_PRIMARY_KEY = sys.intern("PRIMARY_KEY")
+_FOREIGN_KEY = sys.intern("FOREIGN_KEY")
+_CONSTRAINT = sys.intern("CONSTRAINT")
+_ARG = sys.intern("ARG")
+_TABLE = sys.intern("TABLE")
+_COLUMNS = sys.intern("COLUMNS")
+_TYPE = sys.intern("TYPE")
+_UNIQUE = sys.intern("UNIQUE")
+_TIMING = sys.intern("TIMING")
+_EVENTS = sys.intern("EVENTS")
+_FOR_EACH_ROW = sys.intern("FOR_EACH_ROW")
+_WHEN_CONDITION = sys.intern("WHEN_CONDITION")
+_TRIGGER_BODY = sys.intern("TRIGGER_BODY")
+_SELECT = sys.intern("SELECT")
+_MATERIALIZED = sys.intern("MATERIALIZED")
+_QUERY = sys.intern("QUERY")
+_IF_EXISTS = sys.intern("IF_EXISTS")
+_PARAMETERS = sys.intern("PARAMETERS")
+_PARAMETER = sys.intern("PARAMETER")
+_RETURN_TYPE = sys.intern("RETURN_TYPE")
+_PROCEDURE_BODY = sys.intern("PROCEDURE_BODY")
+_ARGUMENTS = sys.intern("ARGUMENTS")
+_CREATE_VIEW = sys.intern("CREATE_VIEW")
+_DROP_VIEW = sys.intern("DROP_VIEW")
+_CREATE_FUNCTION = sys.intern("CREATE_FUNCTION")
+_DROP_FUNCTION = sys.intern("DROP_FUNCTION")
+_CALL_PROCEDURE = sys.intern("CALL_PROCEDURE")
+_FROM = sys.intern("FROM")
+_ALIAS = sys.intern("ALIAS")
+_JOIN = sys.intern("JOIN")
+_ON = sys.intern("ON")
+_GROUP_BY = sys.intern("GROUP_BY")
+_ORDER_BY = sys.intern("ORDER_BY")
+
+
+# 数值常量文法：与词法分析器 lex_number 产生的数字 CONST 一致（数字开头，至多一个小数点，
+# 允许 "1." 这样的写法），外加可选的正负号；"1.2.3"、".." 之类不算数值。
+# 整数是其中不带小数点的部分，WHERE 与 INSERT/UPDATE 共用同一套符号规则
+# （int() 还会接受空白和下划线，这里不放宽到那种程度）
+_SIGNED_INT_PATTERN = r"[+-]?\d+"
+_SIGNED_NUMBER_PATTERN = _SIGNED_INT_PATTERN + r"(?:\.\d*)?"
+_is_numeric_literal = re.compile(_SIGNED_NUMBER_PATTERN).fullmatch
+_is_int_literal = re.compile(_SIGNED_INT_PATTERN).fullmatch
+# 表达式中的标识符（可能的列名）
+_find_identifiers = re.compile(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b').findall
+# 表达式检查时跳过的常见 SQL 函数名
+_SQL_FUNCTIONS = frozenset({'NOW', 'COUNT', 'SUM', 'AVG', 'MAX', 'MIN', 'UPPER', 'LOWER', 'LENGTH'})
+# 触发器允许的触发时机与触发事件
+_VALID_TIMINGS = frozenset(("BEFORE", "AFTER", "INSTEAD OF"))
+_VALID_EVENTS = frozenset(("INSERT", "UPDATE", "DELETE"))
+# 触发器中引用新旧行的限定前缀（OLD.column / NEW.column）
+_TRIGGER_ROW_PREFIXES = frozenset(("OLD", "NEW"))
+# SUM/AVG 允许的数值列类型
+_NUMERIC_TYPES = frozenset(("INT", "DOUBLE", "FLOAT"))
+# 只检查左侧列的谓词节点 -> 列不存在时的错误信息
+_PREDICATE_COLUMN_MESSAGES = {
+    _BETWEEN: "BETWEEN 子句中的列不存在",
+    _IN: "IN 子句中的列不存在",
+    _LIKE: "LIKE 子句中的列不存在",
+}
+
+
+def _check_int_value(col, val, sval):
+    # 已经是整数的值（非解析器产生的 AST）无需再做字符串匹配
+    if type(val) is int:
+        return None
+    # 跳过触发器引用（OLD.column, NEW.column）的类型检查
+    if not sval.startswith(("OLD.", "NEW.")) and not _is_int_literal(sval):
+        return ("TypeError", col, "期望 INT, 但得到 {}", val)
+    return None
+
+
+def _check_varchar_value(col, val, sval):
+    if not isinstance(val, str):
+        return ("TypeError", col, "期望 VARCHAR, 但得到 {}", val)
+    return None
+
+
+# 列类型 -> INSERT/UPDATE 值检查函数；未列出的类型不做值检查
+_INSERT_VALUE_CHECKS = {"INT": _check_int_value, "VARCHAR": _check_varchar_value}
+
+
+def _build_column_checks(column_types):
+    """建表时为每列选好值检查函数：返回 {列名: (期望类型, 值检查函数或 None)}"""
+    return {col: (col_type, _INSERT_VALUE_CHECKS.get(col_type)) for col, col_type in column_types.items()}
+
+
+def _build_insert_validator(plan):
+    """
+    为一张表生成 INSERT 值校验函数，plan 为 _build_column_checks 的结果。
+    返回的函数对 (列名列表, 值列表, 存储过程参数) 做校验：
+    通过时返回 None，否则返回 (error_type, position, message, *message_args)，
+    消息模板在真正输出错误时才格式化。
+    """
+    def validate(columns, values, params):
+        for col, val in zip(columns, values):
+            entry = plan.get(col)
+            if entry is None:
+                return ("ColumnError", col, "列不存在")
+            expected_type, check = entry
+            sval = str(val)
+
+            # 检查值是否为存储过程参数
+            param_type = params.get(sval, _MISSING) if params else _MISSING
+            if param_type is not _MISSING:
+                if param_type != expected_type:
+                    return ("TypeError", col,
+                            "参数类型不匹配：期望 {}, 参数 {} 类型为 {}", expected_type, val, param_type)
+            elif check is not None:
+                error = check(col, val, sval)
+                if error is not None:
+                    return error
+        return None
+
+    return validate
+
 class SemanticError(Exception):
-    def __init__(self, error_type, position, message, available_tables=None, available_columns=None):
+    # 异常在批量校验时会大量创建：消息和诊断上下文都延迟到访问时才生成
+
+    def __init__(self, error_type, position, message, available_tables=None, available_columns=None,
+                 analyzer=None, message_args=None):
         self.error_type = error_type
         self.position = position
-        self.message = message
-        
-        if DIAGNOSTICS_AVAILABLE:
-            # 使用智能诊断
+        # 传入 message_args 时 message 为 str.format 模板，首次访问 message 时才格式化
+        self._message = message
+        self._message_args = message_args
+        # 可用表/列只在格式化错误信息时才需要：可传入列表或无参可调用对象，
+        # 传入 analyzer 时仅保存弱引用，均在首次访问时才计算
+        self._analyzer = weakref.ref(analyzer) if analyzer is not None else None
+        self._available_tables = available_tables
+        self._available_columns = available_columns
+        self._diagnostic = None
+        # 不在构造时格式化消息，需要时由 __str__ 生成；args 保存原始字段，便于复制/序列化
+        super().__init__(error_type, position, message)
+
+    @property
+    def message(self):
+        if self._message_args is not None:
+            self._message = self._message.format(*self._message_args)
+            self._message_args = None
+        return self._message
+
+    def __reduce__(self):
+        return (type(self), (self.error_type, self.position, self.message))
+
+    @property
+    def available_tables(self):
+        if callable(self._available_tables):
+            self._available_tables = self._available_tables()
+        if self._available_tables is None and self._analyzer is not None:
+            analyzer = self._analyzer()
+            if analyzer is not None:
+                self._available_tables = analyzer._get_available_tables()
+        return self._available_tables
+
+    @property
+    def available_columns(self):
+        if callable(self._available_columns):
+            self._available_columns = self._available_columns()
+        if self._available_columns is None and self._analyzer is not None:
+            analyzer = self._analyzer()
+            if analyzer is not None:
+                self._available_columns = analyzer._get_available_columns()
+        return self._available_columns
+
+    @property
+    def diagnostic(self):
+        """智能诊断结果，首次访问时生成"""
+        if self._diagnostic is None and DIAGNOSTICS_AVAILABLE:
             diagnostic_engine = SmartErrorDiagnostic()
-            
-            self.diagnostic = diagnostic_engine.diagnose_semantic_error(
-                error_type, position, message, available_tables, available_columns
+            self._diagnostic = diagnostic_engine.diagnose_semantic_error(
+                self.error_type, self.position, self.message,
+                self.available_tables, self.available_columns
             )
-            enhanced_message = ErrorFormatter.format_diagnostic(self.diagnostic)
-            super().__init__(enhanced_message)
-        else:
-            # 回退到原始错误格式
-            super().__init__(f"[{error_type}, {position}, {message}]")
+        return self._diagnostic
 
     def __str__(self):
-        if hasattr(self, 'diagnostic') and DIAGNOSTICS_AVAILABLE:
+        if DIAGNOSTICS_AVAILABLE:
             return ErrorFormatter.format_diagnostic(self.diagnostic)
         else:
             return f"[{self.error_type}, {self.position}, {self.message}]"
 
 
+# 外键记录：固定字段，用属性访问代替字典查找
+ForeignKey = namedtuple("ForeignKey", "column references_table references_column")
+
+
+def _as_foreign_key(fk):
+    """兼容以字典形式传入的外键定义"""
+    if isinstance(fk, ForeignKey):
+        return fk
+    return ForeignKey(fk['column'], fk['references_table'], fk['references_column'])
+
+
 class Catalog:
     """
     增强的模式目录（记录表结构、主键、外键约束）
     """
+    # 固定属性布局：语义检查的热路径上频繁访问目录属性，去掉实例 __dict__
+    __slots__ = ("tables", "primary_keys", "_pk_order", "foreign_keys", "_ref_index", "constraints",
+                 "views", "procedures", "_version", "_col_index", "_column_sets", "_names",
+                 "_column_checks", "_insert_validators", "_unresolved_fk_tables")
+
     def __init__(self):
         self.tables = {}  # {table_name: {column_name: column_type}}
-        self.primary_keys = {}  # {table_name: [primary_key_columns]}
-        self.foreign_keys = {}  # {table_name: [{column: str, references_table: str, references_column: str}]}
+        self.primary_keys = {}  # {table_name: frozenset(primary_key_columns)}，用于 O(1) 成员判断
+        self._pk_order = {}  # {table_name: (primary_key_columns,)}，保留定义顺序
+        self.foreign_keys = {}  # {table_name: [ForeignKey(column, references_table, references_column)]}
+        self._ref_index = {}  # {被引用表名: [(引用方表名, fk)]}，外键反向索引
         self.constraints = {}  # {table_name: {column_name: [constraints]}} (NOT NULL, UNIQUE等)
         self.views = {}  # {view_name: {columns: {column_name: column_type}, query: dict, materialized: bool}}
         self.procedures = {}  # {procedure_name: {parameters: list, body: dict, return_type: str, is_function: bool}}
+        self._version = 0  # 目录版本号，每次模式变更时递增（用于语义检查缓存失效）
+        self._col_index = {}  # {column_name: {包含该列的表名}}，列 -> 表倒排索引
+        self._column_sets = {}  # {table_name: frozenset(column_names)}，仅做存在性判断时使用
+        self._names = {}  # {对象名: 使用该名称的表/视图/存储过程个数}，用于快速排除命名冲突
+        self._column_checks = {}  # {table_name: {column_name: (column_type, 值检查函数或 None)}}
+        self._insert_validators = {}  # {table_name: 建表时生成的 INSERT 值校验函数}
+        # 外键引用的表/列在登记时尚不存在的表；其余表的外键引用在登记时已确认，
+        # 且被引用的表在引用存在期间不能删除，INSERT 时无需重复检查
+        self._unresolved_fk_tables = set()
 
     def create_table(self, table_name, columns, primary_keys=None, foreign_keys=None, constraints=None):
         if table_name in self.tables:
             raise SemanticError("TableError", table_name, "表已存在")
         
+        # 表名/列名驻留，与词法分析器驻留的标识符共享同一对象，后续查找按身份比较即可命中
+        table_name = sys.intern(table_name)
+        columns = {sys.intern(column_name): column_type for column_name, column_type in columns.items()}
         self.tables[table_name] = columns
-        self.primary_keys[table_name] = primary_keys or []
-        self.foreign_keys[table_name] = foreign_keys or []
+        self.primary_keys[table_name] = frozenset(primary_keys or ())
+        self._pk_order[table_name] = tuple(primary_keys or ())
+        self.foreign_keys[table_name] = [_as_foreign_key(fk) for fk in foreign_keys or ()]
+        for fk in self.foreign_keys[table_name]:
+            self._ref_index.setdefault(fk.references_table, []).append((table_name, fk))
         self.constraints[table_name] = constraints or {}
+        self._register_name(table_name)
+        self._column_sets[table_name] = frozenset(columns)
+        checks = self._column_checks[table_name] = _build_column_checks(columns)
+        self._insert_validators[table_name] = _build_insert_validator(checks)
+        for column_name in columns:
+            self._col_index.setdefault(column_name, set()).add(table_name)
+        self._track_fk_resolution(table_name)
+        self._version += 1
 
     def drop_table(self, table_name):
         """删除表及其所有约束"""
@@ -71,33 +297,64 @@ class Catalog:
             raise SemanticError("TableError", table_name, "要删除的表不存在")
         
         # 检查是否有其他表引用此表作为外键
-        for other_table, fks in self.foreign_keys.items():
-            if other_table != table_name:
-                for fk in fks:
-                    if fk.get('references_table') == table_name:
-                        raise SemanticError(
-                            "ForeignKeyError", table_name, 
-                            f"无法删除表，被表 {other_table} 的外键约束引用"
-                        )
+        blockers = self.get_referencing_foreign_keys(table_name)
+        if blockers:
+            raise SemanticError(
+                "ForeignKeyError", table_name, 
+                f"无法删除表，被表 {blockers[0][0]} 的外键约束引用"
+            )
         
         # 删除表和所有相关约束
+        for column_name in self.tables[table_name]:
+            owners = self._col_index.get(column_name)
+            if owners is not None:
+                owners.discard(table_name)
+                if not owners:
+                    del self._col_index[column_name]
         del self.tables[table_name]
+        del self._column_sets[table_name]
+        del self._column_checks[table_name]
+        del self._insert_validators[table_name]
         del self.primary_keys[table_name]
-        del self.foreign_keys[table_name]
+        del self._pk_order[table_name]
+        for fk in self.foreign_keys.pop(table_name):
+            entries = self._ref_index.get(fk.references_table)
+            if entries:
+                entries[:] = [entry for entry in entries if entry[0] != table_name]
+                if not entries:
+                    del self._ref_index[fk.references_table]
+        self._ref_index.pop(table_name, None)
         del self.constraints[table_name]
+        self._unresolved_fk_tables.discard(table_name)
+        self._release_name(table_name)
+        self._version += 1
+
+    def _register_name(self, name):
+        self._names[name] = self._names.get(name, 0) + 1
+
+    def _release_name(self, name):
+        count = self._names.get(name, 0) - 1
+        if count > 0:
+            self._names[name] = count
+        else:
+            self._names.pop(name, None)
 
     def create_view(self, view_name, columns, query, materialized=False):
         """创建视图"""
-        if view_name in self.views:
-            raise SemanticError("ViewError", view_name, "视图已存在")
-        if view_name in self.tables:
-            raise SemanticError("ViewError", view_name, "视图名与已存在的表名冲突")
+        # 名称未被任何对象使用时（常见情况）跳过逐类冲突检查
+        if view_name in self._names:
+            if view_name in self.views:
+                raise SemanticError("ViewError", view_name, "视图已存在")
+            if view_name in self.tables:
+                raise SemanticError("ViewError", view_name, "视图名与已存在的表名冲突")
         
         self.views[view_name] = {
             'columns': columns,
             'query': query,
             'materialized': materialized
         }
+        self._register_name(view_name)
+        self._version += 1
 
     def drop_view(self, view_name):
         """删除视图"""
@@ -105,6 +362,8 @@ class Catalog:
             raise SemanticError("ViewError", view_name, "要删除的视图不存在")
         
         del self.views[view_name]
+        self._release_name(view_name)
+        self._version += 1
 
     def has_view(self, view_name):
         """检查视图是否存在"""
@@ -118,12 +377,14 @@ class Catalog:
 
     def create_procedure(self, proc_name, parameters, body, return_type=None, is_function=False):
         """创建存储过程或函数"""
-        if proc_name in self.procedures:
-            raise SemanticError("ProcedureError", proc_name, "存储过程已存在")
-        if proc_name in self.tables:
-            raise SemanticError("ProcedureError", proc_name, "存储过程名与已存在的表名冲突")
-        if proc_name in self.views:
-            raise SemanticError("ProcedureError", proc_name, "存储过程名与已存在的视图名冲突")
+        # 名称未被任何对象使用时（常见情况）跳过逐类冲突检查
+        if proc_name in self._names:
+            if proc_name in self.procedures:
+                raise SemanticError("ProcedureError", proc_name, "存储过程已存在")
+            if proc_name in self.tables:
+                raise SemanticError("ProcedureError", proc_name, "存储过程名与已存在的表名冲突")
+            if proc_name in self.views:
+                raise SemanticError("ProcedureError", proc_name, "存储过程名与已存在的视图名冲突")
         
         self.procedures[proc_name] = {
             'parameters': parameters,
@@ -131,6 +392,8 @@ class Catalog:
             'return_type': return_type,
             'is_function': is_function
         }
+        self._register_name(proc_name)
+        self._version += 1
 
     def drop_procedure(self, proc_name):
         """删除存储过程或函数"""
@@ -138,6 +401,8 @@ class Catalog:
             raise SemanticError("ProcedureError", proc_name, "要删除的存储过程不存在")
         
         del self.procedures[proc_name]
+        self._release_name(proc_name)
+        self._version += 1
 
     def has_procedure(self, proc_name):
         """检查存储过程是否存在"""
@@ -153,19 +418,24 @@ class Catalog:
         return table_name in self.tables
 
     def has_column(self, table_name, column_name):
-        return self.has_table(table_name) and column_name in self.tables[table_name]
+        return column_name in self._column_sets.get(table_name, _EMPTY_SET)
+
+    def tables_containing_column(self, column_name):
+        """返回包含指定列的所有表名集合（目录内部的索引集合，不做复制，调用方不要修改）"""
+        return self._col_index.get(column_name, _EMPTY_SET)
 
     def get_column_type(self, table_name, column_name):
         return self.tables[table_name].get(column_name, None)
 
     def get_primary_keys(self, table_name):
-        return self.primary_keys.get(table_name, [])
+        """按定义顺序返回主键列"""
+        return self._pk_order.get(table_name, ())
 
     def get_foreign_keys(self, table_name):
         return self.foreign_keys.get(table_name, [])
 
     def has_primary_key(self, table_name, column_name):
-        return column_name in self.primary_keys.get(table_name, [])
+        return column_name in self.primary_keys.get(table_name, _EMPTY_SET)
     
     # 索引管理方法（未来扩展）
     def create_index(self, index_name, table_name, columns, index_type="BTREE", is_unique=False):
@@ -183,26 +453,44 @@ class Catalog:
         if table_name not in self.foreign_keys:
             self.foreign_keys[table_name] = []
         
-        self.foreign_keys[table_name].append({
-            'column': column_name,
-            'references_table': ref_table,
-            'references_column': ref_column
-        })
+        fk = ForeignKey(column_name, ref_table, ref_column)
+        self.foreign_keys[table_name].append(fk)
+        self._ref_index.setdefault(ref_table, []).append((table_name, fk))
+        self._track_fk_resolution(table_name)
+        self._version += 1
+
+    def _track_fk_resolution(self, table_name):
+        """记录表的外键是否都引用了已存在的表和列"""
+        for fk in self.foreign_keys.get(table_name, ()):
+            ref_columns = self.tables.get(fk.references_table)
+            if ref_columns is None or fk.references_column not in ref_columns:
+                self._unresolved_fk_tables.add(table_name)
+                return
+        self._unresolved_fk_tables.discard(table_name)
+
+    def has_unresolved_foreign_keys(self, table_name):
+        """表是否存在登记时引用目标尚不存在的外键"""
+        return table_name in self._unresolved_fk_tables
+
+    def get_referencing_foreign_keys(self, table_name):
+        """返回引用指定表的外键 [(引用方表名, fk)]，不含自引用"""
+        return [entry for entry in self._ref_index.get(table_name, ()) if entry[0] != table_name]
 
     def validate_foreign_key_references(self):
         """验证所有外键引用的完整性"""
         errors = []
-        for table_name, fks in self.foreign_keys.items():
-            for fk in fks:
-                ref_table = fk['references_table']
-                ref_column = fk['references_column']
+        for ref_table, entries in self._ref_index.items():
+            # 被引用表是否存在只需判断一次
+            ref_columns = self.tables.get(ref_table)
+            for table_name, fk in entries:
+                ref_column = fk.references_column
                 
                 # 检查引用的表是否存在
-                if not self.has_table(ref_table):
+                if ref_columns is None:
                     errors.append(f"表 {table_name} 的外键引用了不存在的表 {ref_table}")
                 
                 # 检查引用的列是否存在
-                elif not self.has_column(ref_table, ref_column):
+                elif ref_column not in ref_columns:
                     errors.append(f"表 {table_name} 的外键引用了表 {ref_table} 中不存在的列 {ref_column}")
                 
                 # 检查引用的列是否是主键（推荐但不强制）
@@ -214,18 +502,48 @@ class Catalog:
 
 
 class SemanticAnalyzer:
-    def __init__(self, catalog: Catalog):
+    # 固定属性布局；保留 __weakref__，SemanticError 以弱引用持有分析器
+    __slots__ = ("catalog", "current_procedure_params", "current_local_vars", "_cache_ver",
+                 "_cached_tables", "_cached_cols", "_log_level",
+                 "__weakref__")
+
+    def __init__(self, catalog: Catalog, verbose=False):
         self.catalog = catalog
+        # [OK]/[WARN] 检查过程信息的日志级别：默认 DEBUG，verbose 时提升为 INFO；
+        # 未开启对应级别时不会格式化这些信息
+        self._log_level = logging.INFO if verbose else logging.DEBUG
         self.current_procedure_params = {}  # 当前存储过程的参数作用域
         self.current_local_vars = {}  # 当前存储过程的局部变量作用域
+        self._cache_ver = -1  # 可用表/列缓存对应的目录版本
+        self._cached_tables = []
+        self._cached_cols = {}
     
+    def _refresh_available_cache(self):
+        """目录版本变化时重建可用表/列缓存"""
+        if self._cache_ver != self.catalog._version:
+            self._cached_tables = list(self.catalog.tables.keys())
+            self._cached_cols = {table: list(columns.keys()) for table, columns in self.catalog.tables.items()}
+            self._cache_ver = self.catalog._version
+
     def _get_available_tables(self):
         """获取可用表列表"""
-        return list(self.catalog.tables.keys())
+        self._refresh_available_cache()
+        return self._cached_tables
     
     def _get_available_columns(self):
         """获取可用列映射"""
-        return {table: list(columns.keys()) for table, columns in self.catalog.tables.items()}
+        self._refresh_available_cache()
+        return self._cached_cols
+
+    def _error(self, error_type, position, message, *message_args):
+        """构造附带可用表/列诊断上下文的 SemanticError（上下文和消息模板都在格式化时才计算）"""
+        return SemanticError(error_type, position, message, analyzer=self,
+                             message_args=message_args or None)
+
+    def _attach_context(self, error):
+        """为目录层抛出的 SemanticError 就地补上诊断上下文，无需重新构造异常"""
+        if error._analyzer is None and error._available_tables is None:
+            error._analyzer = weakref.ref(self)
 
     def analyze(self, ast):
         # 如果传入的是列表，遍历处理
@@ -237,35 +555,9 @@ class SemanticAnalyzer:
             self._analyze_node(ast)
     
     def _analyze_node(self, ast):
-        node_type = ast.node_type.upper()
-        if node_type == "CREATE_TABLE":
-            self._check_create(ast)
-        elif node_type == "INSERT":
-            self._check_insert(ast)
-        elif node_type == "SELECT":
-            self._check_select(ast)
-        elif node_type == "UPDATE":
-            self._check_update(ast)
-        elif node_type == "DELETE":
-            self._check_delete(ast)
-        elif node_type == "DROP_TABLE":
-            self._check_drop(ast)
-        elif node_type in ["BEGIN_TRANSACTION", "COMMIT", "ROLLBACK"]:
-            self._check_transaction_statement(ast)
-        elif node_type in ["CREATE_INDEX", "DROP_INDEX"]:
-            self._check_index_statement(ast)
-        elif node_type in ["CREATE_TRIGGER", "DROP_TRIGGER"]:
-            self._check_trigger_statement(ast)
-        elif node_type in ["CREATE_VIEW", "DROP_VIEW"]:
-            self._check_view_statement(ast)
-        elif node_type in ["CREATE_PROCEDURE", "CREATE_FUNCTION", "DROP_PROCEDURE", "DROP_FUNCTION", "CALL_PROCEDURE"]:
-            self._check_procedure_statement(ast)
-        elif node_type == "DECLARE_STATEMENT":
-            self._check_declare_statement(ast)
-        elif node_type == "SET_STATEMENT":
-            self._check_set_statement(ast)
-        elif node_type == "DELIMITER_STATEMENT":
-            self._check_delimiter_statement(ast)
+        handler = self._DISPATCH.get(ast.node_type)  # ASTNode 构造时已统一为大写
+        if handler is not None:
+            handler(self, ast)
 
     def _check_create(self, ast):
         table_name = ast.value
@@ -275,287 +567,276 @@ class SemanticAnalyzer:
         constraints = {}
         
         for child in ast.children:
-            if child.node_type == "COLUMN":
-                col_name = child.value.split(":")[0]
-                col_type = child.value.split(":")[1]
+            if child.node_type is _COLUMN:
+                col_name, col_type = child.value  # 解析器已给出 (列名, 类型)
                 columns[col_name] = col_type
                 
-            elif child.node_type == "PRIMARY_KEY":
-                primary_keys = child.value.split(",")
+            elif child.node_type is _PRIMARY_KEY:
+                primary_keys = child.value  # 解析器已给出主键列元组
                 
-            elif child.node_type == "FOREIGN_KEY":
-                # 格式: column:ref_table.ref_column
-                parts = child.value.split(":")
-                fk_column = parts[0]
-                ref_parts = parts[1].split(".")
-                ref_table = ref_parts[0]
-                ref_column = ref_parts[1]
+            elif child.node_type is _FOREIGN_KEY:
+                # 解析器已给出 (column, ref_table, ref_column)
+                foreign_keys.append(ForeignKey(*child.value))
                 
-                foreign_keys.append({
-                    'column': fk_column,
-                    'references_table': ref_table,
-                    'references_column': ref_column
-                })
-                
-            elif child.node_type == "CONSTRAINT":
-                # 格式: column:constraint_type
-                col_name, constraint_type = child.value.split(":")
-                if col_name not in constraints:
-                    constraints[col_name] = []
-                constraints[col_name].append(constraint_type)
+            elif child.node_type is _CONSTRAINT:
+                # 解析器已给出 (column, constraint_type)
+                col_name, constraint_type = child.value
+                constraints.setdefault(col_name, []).append(constraint_type)
         
         # 验证主键列存在
         for pk_col in primary_keys:
             if pk_col not in columns:
-                raise SemanticError(
-                    "PrimaryKeyError", pk_col, f"主键列 '{pk_col}' 不存在于表定义中",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
-                )
+                raise self._error("PrimaryKeyError", pk_col, f"主键列 '{pk_col}' 不存在于表定义中")
         
         # 验证外键列存在
+        has_table = self.catalog.has_table
+        has_column = self.catalog.has_column
         for fk in foreign_keys:
-            if fk['column'] not in columns:
-                raise SemanticError(
-                    "ForeignKeyError", fk['column'], f"外键列 '{fk['column']}' 不存在于表定义中",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
-                )
+            if fk.column not in columns:
+                raise self._error("ForeignKeyError", fk.column, f"外键列 '{fk.column}' 不存在于表定义中")
             
             # 检查引用的表是否存在
-            ref_table = fk['references_table']
-            if not self.catalog.has_table(ref_table):
-                raise SemanticError(
+            ref_table = fk.references_table
+            if not has_table(ref_table):
+                raise self._error(
                     "ForeignKeyError", ref_table, 
-                    f"外键引用的表 '{ref_table}' 不存在",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
+                    f"外键引用的表 '{ref_table}' 不存在"
                 )
             
             # 检查引用的列是否存在
-            if not self.catalog.has_column(ref_table, fk['references_column']):
-                raise SemanticError(
-                    "ForeignKeyError", fk['references_column'], 
-                    f"外键引用的列 '{fk['references_column']}' 在表 '{ref_table}' 中不存在",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
+            if not has_column(ref_table, fk.references_column):
+                raise self._error(
+                    "ForeignKeyError", fk.references_column, 
+                    f"外键引用的列 '{fk.references_column}' 在表 '{ref_table}' 中不存在"
                 )
         
         try:
             self.catalog.create_table(table_name, columns, primary_keys, foreign_keys, constraints)
-            print(f"[OK] CREATE TABLE {table_name} 语义检查通过")
-            
-            # 输出约束信息
-            if primary_keys:
-                print(f"    主键: {', '.join(primary_keys)}")
-            if foreign_keys:
-                for fk in foreign_keys:
-                    print(f"    外键: {fk['column']} -> {fk['references_table']}.{fk['references_column']}")
-            if constraints:
-                for col, cons in constraints.items():
-                    print(f"    约束: {col} - {', '.join(cons)}")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] CREATE TABLE {table_name} 语义检查通过")
+
+                # 输出约束信息
+                if primary_keys:
+                    logger.log(self._log_level, f"    主键: {', '.join(primary_keys)}")
+                if foreign_keys:
+                    for fk in foreign_keys:
+                        logger.log(self._log_level, f"    外键: {fk.column} -> {fk.references_table}.{fk.references_column}")
+                if constraints:
+                    for col, cons in constraints.items():
+                        logger.log(self._log_level, f"    约束: {col} - {', '.join(cons)}")
                     
         except SemanticError as e:
-            # 重新抛出带有上下文的错误
-            raise SemanticError(
-                e.error_type, e.position, e.message,
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+            # 补上诊断上下文后原样抛出
+            self._attach_context(e)
+            raise
 
     def _check_insert(self, ast):
         table_name = ast.value
         if not self.catalog.has_table(table_name):
-            raise SemanticError(
-                "TableError", table_name, "表不存在",
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+            raise self._error("TableError", table_name, "表不存在")
 
-        columns = [c.value for c in ast.children if c.node_type == "COLUMN"]
-        values = [v.value for v in ast.children if v.node_type == "VALUE"]
+        # 一次遍历同时收集列名和值
+        columns = []
+        values = []
+        for child in ast.children:
+            child_type = child.node_type
+            if child_type is _COLUMN:
+                columns.append(child.value)
+            elif child_type is _VALUE:
+                values.append(child.value)
 
         if len(columns) != len(values):
-            raise SemanticError(
-                "ColumnCountError", table_name, "列数和值数量不一致",
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+            raise self._error("ColumnCountError", table_name, "列数和值数量不一致")
 
-        for col, val in zip(columns, values):
-            if not self.catalog.has_column(table_name, col):
-                raise SemanticError(
-                    "ColumnError", col, "列不存在",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
-                )
-            expected_type = self.catalog.get_column_type(table_name, col)
-            
-            # 检查值是否为存储过程参数
-            if str(val) in self.current_procedure_params:
-                param_type = self.current_procedure_params[str(val)]
-                if param_type != expected_type:
-                    raise SemanticError(
-                        "TypeError", col, 
-                        f"参数类型不匹配：期望 {expected_type}, 参数 {val} 类型为 {param_type}",
-                        available_tables=self._get_available_tables(),
-                        available_columns=self._get_available_columns()
-                    )
-            elif expected_type == "INT":
-                # 跳过触发器引用（OLD.column, NEW.column）的类型检查
-                if not (str(val).startswith("OLD.") or str(val).startswith("NEW.")):
-                    if not str(val).isdigit():
-                        raise SemanticError(
-                            "TypeError", col, f"期望 INT, 但得到 {val}",
-                            available_tables=self._get_available_tables(),
-                            available_columns=self._get_available_columns()
-                        )
-            elif expected_type == "VARCHAR":
-                if not isinstance(val, str):
-                    raise SemanticError(
-                        "TypeError", col, f"期望 VARCHAR, 但得到 {val}",
-                        available_tables=self._get_available_tables(),
-                        available_columns=self._get_available_columns()
-                    )
+        # 使用建表时为该表生成的专用校验函数，逐列直接检查，不再查询目录
+        error = self.catalog._insert_validators[table_name](columns, values, self.current_procedure_params)
+        if error is not None:
+            raise self._error(*error)
 
         # 检查主键约束
+        col_index = {}
+        for i, c in enumerate(columns):
+            col_index.setdefault(c, i)  # 与 list.index 一致，取首次出现的位置
         primary_keys = self.catalog.get_primary_keys(table_name)
         for pk_col in primary_keys:
-            if pk_col not in columns:
-                raise SemanticError(
-                    "PrimaryKeyError", pk_col, f"INSERT 语句缺少主键列 '{pk_col}' 的值",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
-                )
+            pk_index = col_index.get(pk_col)
+            if pk_index is None:
+                raise self._error("PrimaryKeyError", pk_col, f"INSERT 语句缺少主键列 '{pk_col}' 的值")
             # 检查主键值不为空
-            pk_index = columns.index(pk_col)
             if not values[pk_index] or str(values[pk_index]).strip() == "":
-                raise SemanticError(
-                    "PrimaryKeyError", pk_col, f"主键列 '{pk_col}' 的值不能为空",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
-                )
+                raise self._error("PrimaryKeyError", pk_col, f"主键列 '{pk_col}' 的值不能为空")
 
-        # 检查外键约束
+        # 检查外键约束：引用目标在登记外键时已确认存在的表无需逐行重复检查
         foreign_keys = self.catalog.get_foreign_keys(table_name)
-        for fk in foreign_keys:
-            fk_col = fk['column']
-            if fk_col in columns:
-                fk_index = columns.index(fk_col)
-                fk_value = values[fk_index]
-                
+        if foreign_keys and self.catalog.has_unresolved_foreign_keys(table_name):
+            for fk in foreign_keys:
+                fk_col = fk.column
+                if col_index.get(fk_col) is None:
+                    continue
+
                 # 检查外键引用的表和列是否存在
-                ref_table = fk['references_table']
-                ref_column = fk['references_column']
+                ref_table = fk.references_table
+                ref_column = fk.references_column
                 
                 if not self.catalog.has_table(ref_table):
-                    raise SemanticError(
-                        "ForeignKeyError", fk_col, f"外键引用的表 '{ref_table}' 不存在",
-                        available_tables=self._get_available_tables(),
-                        available_columns=self._get_available_columns()
-                    )
+                    raise self._error("ForeignKeyError", fk_col, f"外键引用的表 '{ref_table}' 不存在")
                     
                 if not self.catalog.has_column(ref_table, ref_column):
-                    raise SemanticError(
-                        "ForeignKeyError", fk_col, f"外键引用的列 '{ref_column}' 在表 '{ref_table}' 中不存在",
-                        available_tables=self._get_available_tables(),
-                        available_columns=self._get_available_columns()
-                    )
+                    raise self._error("ForeignKeyError", fk_col, f"外键引用的列 '{ref_column}' 在表 '{ref_table}' 中不存在")
 
-        print(f"[OK] INSERT INTO {table_name} 语义检查通过")
-        if primary_keys:
-            print(f"    主键约束检查通过")
-        if foreign_keys:
-            print(f"    外键约束检查通过")
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, f"[OK] INSERT INTO {table_name} 语义检查通过")
+            if primary_keys:
+                logger.log(self._log_level, "    主键约束检查通过")
+            if foreign_keys:
+                logger.log(self._log_level, "    外键约束检查通过")
+
+    @staticmethod
+    def _operands(node):
+        """一次遍历取出条件节点的第一个 LEFT 和第一个 RIGHT 子节点"""
+        left = right = None
+        for child in node.children:
+            node_type = child.node_type
+            if node_type is _LEFT:
+                if left is None:
+                    left = child
+            elif node_type is _RIGHT:
+                if right is None:
+                    right = child
+        return left, right
 
     def _check_select(self, ast):
         # 获取主表和所有涉及的表
         tables = []
-        table_aliases = {}  # 别名映射：alias -> table_name
+        resolver = {}  # 名称解析：表名/别名 -> 实际表名（别名优先）
         main_table = None
         
+        # 一次遍历取出各子句（各取第一个），同时按出现顺序收集 SELECT 列和聚合函数；
+        # 它们的检查要等 FROM/JOIN 确定可见表之后进行
+        from_node = where_node = group_by_node = order_by_node = None
+        select_items = []
+        for child in ast.children:
+            node_type = child.node_type
+            if node_type is _COLUMN or node_type is _AGGREGATE:
+                select_items.append(child)
+            elif node_type is _FROM:
+                if from_node is None:
+                    from_node = child
+            elif node_type is _WHERE:
+                if where_node is None:
+                    where_node = child
+            elif node_type is _GROUP_BY:
+                if group_by_node is None:
+                    group_by_node = child
+            elif node_type is _ORDER_BY:
+                if order_by_node is None:
+                    order_by_node = child
+        has_table = self.catalog.has_table
+
         # 查找 FROM 子句
-        from_node = next((child for child in ast.children if child.node_type == "FROM"), None)
         if from_node:
             main_table = from_node.value
-            if not self.catalog.has_table(main_table):
+            if not has_table(main_table):
                 raise SemanticError("TableError", main_table, "表不存在")
             tables.append(main_table)
+            resolver.setdefault(main_table, main_table)
             
+            alias_node = None
+            join_children = []
+            for child in from_node.children:
+                node_type = child.node_type
+                if node_type is _JOIN:
+                    join_children.append(child)
+                elif node_type is _ALIAS and alias_node is None:
+                    alias_node = child
+
             # 检查主表别名
-            alias_node = next((child for child in from_node.children if child.node_type == "ALIAS"), None)
             if alias_node:
-                table_aliases[alias_node.value] = main_table
+                resolver[alias_node.value] = main_table
             
             # 检查 JOIN 表
-            for join_child in from_node.children:
-                if join_child.node_type == "JOIN":
-                    join_table = next((c.value for c in join_child.children if c.node_type == "TABLE"), None)
-                    if join_table:
-                        if not self.catalog.has_table(join_table):
-                            raise SemanticError("TableError", join_table, "JOIN 中的表不存在")
-                        tables.append(join_table)
-                        
-                        # 检查 JOIN 表别名
-                        join_alias_node = next((c for c in join_child.children if c.node_type == "ALIAS"), None)
-                        if join_alias_node:
-                            table_aliases[join_alias_node.value] = join_table
-                        
-                        # 检查 ON 条件
-                        on_node = next((c for c in join_child.children if c.node_type == "ON"), None)
-                        if on_node:
-                            self._check_join_condition(tables, on_node, table_aliases)
+            for join_child in join_children:
+                join_table_node = join_alias_node = on_node = None
+                for child in join_child.children:
+                    node_type = child.node_type
+                    if node_type is _TABLE:
+                        if join_table_node is None:
+                            join_table_node = child
+                    elif node_type is _ALIAS:
+                        if join_alias_node is None:
+                            join_alias_node = child
+                    elif node_type is _ON:
+                        if on_node is None:
+                            on_node = child
+                join_table = join_table_node.value if join_table_node else None
+                if join_table:
+                    if not has_table(join_table):
+                        raise SemanticError("TableError", join_table, "JOIN 中的表不存在")
+                    tables.append(join_table)
+                    resolver.setdefault(join_table, join_table)
+                    
+                    # 检查 JOIN 表别名
+                    if join_alias_node:
+                        resolver[join_alias_node.value] = join_table
+                    
+                    # 检查 ON 条件
+                    if on_node:
+                        self._check_join_condition(tables, on_node, resolver)
 
         # 检查 SELECT 列
         # 如果没有 FROM 子句，这是一个常量查询，跳过列检查
         if not from_node:
-            print(f"[OK] 常量查询 SELECT 语义检查通过")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, "[OK] 常量查询 SELECT 语义检查通过")
             return
             
-        for child in ast.children:
-            if child.node_type == "COLUMN":
+        # 循环中反复调用的方法先绑定为局部变量
+        check_expression = self._check_expression_columns
+        check_aggregate = self._check_aggregate_function
+        for child in select_items:
+            if child.node_type is _COLUMN:
+                value = child.value
                 # 跳过 * 通配符的检查，它表示选择所有列
-                if child.value == "*":
+                if value == "*":
                     continue
 
                 # 处理带别名的列
-                if isinstance(child.value, str) and " AS " in child.value.upper():
-                    # "AS" keyword is case-insensitive
-                    col_part = child.value.upper().split(" AS ")[0].strip()
-                    self._check_expression_columns(col_part, tables, table_aliases)
-                    continue
+                if isinstance(value, str):
+                    upper_value = value.upper()
+                    if " AS " in upper_value:
+                        # "AS" keyword is case-insensitive
+                        check_expression(upper_value.split(" AS ")[0].strip(), tables, resolver)
+                        continue
 
                 # 普通列名或表达式检查
-                col_name = str(child.value)
-                if col_name != "*":
-                    self._check_expression_columns(col_name, tables, table_aliases)
-            elif child.node_type == "AGGREGATE":
+                check_expression(str(value), tables, resolver)
+            else:
                 # 直接检查聚合函数节点
-                self._check_aggregate_function(child, tables, table_aliases)
+                check_aggregate(child, tables, resolver)
 
         # 检查 WHERE 子句
-        where_node = next((child for child in ast.children if child.node_type == "WHERE"), None)
         if where_node:
-            self._check_where_multi_table(tables, where_node, table_aliases)
+            self._check_where_multi_table(tables, where_node, resolver)
+
+        column_exists = self._column_exists_in_tables
 
         # 检查 GROUP BY 子句
-        group_by_node = next((child for child in ast.children if child.node_type == "GROUP_BY"), None)
         if group_by_node:
             for group_col in group_by_node.children:
-                if group_col.node_type == "COLUMN":
-                    if not self._column_exists_in_tables(tables, group_col.value):
+                if group_col.node_type is _COLUMN:
+                    if not column_exists(tables, group_col.value):
                         raise SemanticError("ColumnError", group_col.value, "GROUP BY 中的列不存在")
 
         # 检查 ORDER BY 子句
-        order_by_node = next((child for child in ast.children if child.node_type == "ORDER_BY"), None)
         if order_by_node:
             for sort_col in order_by_node.children:
-                if sort_col.node_type == "SORT":
-                    col_name = sort_col.value.split(":")[0]
-                    if not self._column_exists_in_tables(tables, col_name):
+                if sort_col.node_type is _SORT:
+                    col_name = sort_col.value[0]  # 解析器已给出 (列名, 方向)
+                    if not column_exists(tables, col_name):
                         raise SemanticError("ColumnError", col_name, "ORDER BY 中的列不存在")
 
-        print(f"[OK] SELECT 语义检查通过")
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, "[OK] SELECT 语义检查通过")
 
     def _check_delete(self, ast):
         table_name = ast.value
@@ -563,92 +844,76 @@ class SemanticAnalyzer:
             raise SemanticError("TableError", table_name, "表不存在")
 
         for child in ast.children:
-            if child.node_type == "WHERE":
+            if child.node_type is _WHERE:
                 self._check_where(table_name, child)
 
-        print(f"[OK] DELETE FROM {table_name} 语义检查通过")
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, f"[OK] DELETE FROM {table_name} 语义检查通过")
 
     def _check_where(self, table_name, where_node):
-        left = next((c for c in where_node.children if c.node_type == "LEFT"), None)
-        right = next((c for c in where_node.children if c.node_type == "RIGHT"), None)
-        op = next((c for c in where_node.children if c.node_type == "OP"), None)
+        left, right = self._operands(where_node)
 
-        if left and not self.catalog.has_column(table_name, left.value):
-            raise SemanticError("ColumnError", left.value, "WHERE 子句中的列不存在")
+        columns = self.catalog.tables.get(table_name, _EMPTY_DICT)  # 只解析一次表结构
 
-        # 检查右侧值是否为列名（如果不是常量的话）
-        if right and right.value:
-            right_value = str(right.value)
-            # 如果是存储过程参数，跳过检查
-            if right_value in self.current_procedure_params:
-                pass  # 存储过程参数，跳过检查
-            # 如果是数字，不需要检查
-            elif right_value.replace(".", "").isdigit():
-                pass  # 数字常量，跳过检查
-            # 如果是字符串常量（词法分析器已经去掉了引号），不需要检查
-            # 这里我们假设非数字的CONST都是字符串常量
-            else:
-                # 检查是否真的是列名
-                if self.catalog.has_column(table_name, right.value):
-                    # 如果确实是列名，则允许
-                    pass
-                else:
-                    # 如果不是列名，则认为是字符串常量，跳过检查
-                    pass
+        if left and left.value not in columns:
+            raise SemanticError("ColumnError", left.value, "WHERE 子句中的列不存在")
 
         if left and right:
-            expected_type = self.catalog.get_column_type(table_name, left.value)
+            expected_type = columns.get(left.value)
             right_value = str(right.value)
             
             # 处理字符串常量（去除引号）
             if right_value.startswith("'") and right_value.endswith("'"):
                 right_value = right_value[1:-1]
             
-            if expected_type == "INT" and not right_value.replace(".", "").isdigit():
+            is_numeric = _is_numeric_literal(right_value) is not None
+            if expected_type == "INT" and not is_numeric:
                 raise SemanticError("TypeError", left.value, f"期望 INT, 但 WHERE 得到 {right.value}")
-            if expected_type in ["STRING", "VARCHAR"] and right_value.replace(".", "").isdigit():
+            if expected_type in ["STRING", "VARCHAR"] and is_numeric:
                 raise SemanticError("TypeError", left.value, f"期望 STRING, 但 WHERE 得到 {right.value}")
 
     def _check_update(self, ast):
         table_name = ast.value
-        if not self.catalog.has_table(table_name):
+        # 建表时已为每列选好值检查函数，赋值检查直接取用
+        column_checks = self.catalog._column_checks.get(table_name)
+        if column_checks is None:
             raise SemanticError("TableError", table_name, "表不存在")
+        params = self.current_procedure_params
+        local_vars = self.current_local_vars
 
-        # 检查 SET 子句中的列
+        # 一次遍历：先出现的 SET 赋值逐个检查，WHERE 子句（位于赋值之后）随后检查
         for child in ast.children:
-            if child.node_type == "ASSIGNMENT":
-                col_name, value = child.value.split("=")
-                if not self.catalog.has_column(table_name, col_name):
+            child_type = child.node_type
+            if child_type is _ASSIGNMENT:
+                col_name, value = child.value  # 解析器已给出 (列名, 值表达式)
+                # 检查列存在并取得期望类型与值检查函数
+                entry = column_checks.get(col_name)
+                if entry is None:
                     raise SemanticError("ColumnError", col_name, "列不存在")
+                expected_type, check = entry
                 
-                # 检查类型匹配
-                expected_type = self.catalog.get_column_type(table_name, col_name)
-                
+                param_type = params.get(value, _MISSING)
+                var_type = local_vars.get(value, _MISSING)
                 # 检查值是否为存储过程参数
-                if value in self.current_procedure_params:
-                    param_type = self.current_procedure_params[value]
+                if param_type is not _MISSING:
                     if param_type != expected_type:
-                        raise SemanticError("TypeError", col_name, 
-                                          f"参数类型不匹配：期望 {expected_type}, 参数 {value} 类型为 {param_type}")
+                        raise SemanticError("TypeError", col_name, "参数类型不匹配：期望 {}, 参数 {} 类型为 {}",
+                                            message_args=(expected_type, value, param_type))
                 # 检查值是否为局部变量
-                elif value in self.current_local_vars:
-                    var_type = self.current_local_vars[value]
+                elif var_type is not _MISSING:
                     if var_type != expected_type:
-                        raise SemanticError("TypeError", col_name, 
-                                          f"变量类型不匹配：期望 {expected_type}, 变量 {value} 类型为 {var_type}")
-                elif expected_type == "INT":
-                    if not str(value).isdigit():
-                        raise SemanticError("TypeError", col_name, f"期望 INT, 但得到 {value}")
-                elif expected_type == "VARCHAR":
-                    if not isinstance(value, str):
-                        raise SemanticError("TypeError", col_name, f"期望 VARCHAR, 但得到 {value}")
-
-        # 检查 WHERE 子句（如果存在）
-        for child in ast.children:
-            if child.node_type == "WHERE":
+                        raise SemanticError("TypeError", col_name, "变量类型不匹配：期望 {}, 变量 {} 类型为 {}",
+                                            message_args=(expected_type, value, var_type))
+                elif check is not None:
+                    error = check(col_name, value, str(value))
+                    if error is not None:
+                        error_type, position, message, *message_args = error
+                        raise SemanticError(error_type, position, message, message_args=tuple(message_args))
+            elif child_type is _WHERE:
                 self._check_where(table_name, child)
 
-        print(f"[OK] UPDATE {table_name} 语义检查通过")
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, f"[OK] UPDATE {table_name} 语义检查通过")
 
     def _column_exists_in_tables(self, tables, column_name):
         """检查列是否存在于任何表中，支持 table.column 格式"""
@@ -660,122 +925,93 @@ class SemanticAnalyzer:
                 return True
             return False
         else:
-            # 普通列名，检查是否存在于任何表中
-            for table in tables:
-                if self.catalog.has_column(table, column_name):
-                    return True
-            return False
+            # 普通列名，通过列 -> 表倒排索引检查是否存在于任何表中
+            return not self.catalog.tables_containing_column(column_name).isdisjoint(tables)
 
-    def _column_exists_in_tables_with_aliases(self, tables, column_name, table_aliases):
-        """检查列是否存在于任何表中，支持表别名和 table.column 格式"""
+    def _column_exists_in_tables_with_aliases(self, tables, column_name, resolver):
+        """
+        检查列是否存在于任何表中，支持表别名和 table.column 格式。
+        resolver 为 {表名或别名: 实际表名}，由 _check_select 一次性构建。
+        """
         # 如果是限定列名 (table.column 或 alias.column)
         if '.' in column_name:
             table_or_alias, col_name = column_name.split('.', 1)
-            
-            # 首先检查是否是别名
-            if table_or_alias in table_aliases:
-                actual_table = table_aliases[table_or_alias]
-                if self.catalog.has_column(actual_table, col_name):
-                    return True
-            
-            # 然后检查是否是实际表名
-            if table_or_alias in tables and self.catalog.has_column(table_or_alias, col_name):
+            actual_table = resolver.get(table_or_alias)
+            if actual_table is not None and self.catalog.has_column(actual_table, col_name):
                 return True
-            
-            return False
+            # 别名与参与查询的某个实际表同名时（别名优先），回退按实际表名查找
+            return table_or_alias in tables and self.catalog.has_column(table_or_alias, col_name)
         else:
-            # 普通列名，检查是否存在于任何表中
-            for table in tables:
-                if self.catalog.has_column(table, column_name):
-                    return True
-            return False
+            # 普通列名，通过列 -> 表倒排索引检查是否存在于任何表中
+            return not self.catalog.tables_containing_column(column_name).isdisjoint(tables)
 
-    def _check_join_condition(self, tables, on_node, table_aliases=None):
+    def _check_join_condition(self, tables, on_node, resolver=None):
         """检查 JOIN 的 ON 条件"""
-        left = next((c.value for c in on_node.children if c.node_type == "LEFT"), None)
-        right = next((c.value for c in on_node.children if c.node_type == "RIGHT"), None)
+        left_node, right_node = self._operands(on_node)
+        left = left_node.value if left_node else None
+        right = right_node.value if right_node else None
         
-        if table_aliases is None:
-            table_aliases = {}
+        if resolver is None:
+            resolver = {table: table for table in tables}
         
-        if left and not self._column_exists_in_tables_with_aliases(tables, left, table_aliases):
-            raise SemanticError(
-                "ColumnError", left, "JOIN ON 条件中的左侧列不存在",
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+        if left and not self._column_exists_in_tables_with_aliases(tables, left, resolver):
+            raise self._error("ColumnError", left, "JOIN ON 条件中的左侧列不存在")
             
-        if right and not self._column_exists_in_tables_with_aliases(tables, right, table_aliases):
-            raise SemanticError(
-                "ColumnError", right, "JOIN ON 条件中的右侧列不存在",
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+        if right and not self._column_exists_in_tables_with_aliases(tables, right, resolver):
+            raise self._error("ColumnError", right, "JOIN ON 条件中的右侧列不存在")
 
-    def _check_where_multi_table(self, tables, where_node, table_aliases=None):
+    def _check_where_multi_table(self, tables, where_node, resolver=None):
         """检查多表环境下的 WHERE 条件（支持复杂条件）"""
-        if table_aliases is None:
-            table_aliases = {}
+        if resolver is None:
+            resolver = {table: table for table in tables}
+        # 整棵条件树共用一个表集合，各谓词的列存在性判断不再线性扫描表列表
+        tables = frozenset(tables)
         
-        # 递归检查WHERE条件树
+        # 检查WHERE条件树
         for child in where_node.children:
-            self._check_condition_node(child, tables, table_aliases)
+            self._check_condition_node(child, tables, resolver)
     
-    def _check_condition_node(self, node, tables, table_aliases):
-        """递归检查条件节点"""
-        if node.node_type == "LOGICAL_OP":
-            # 递归检查逻辑操作符的子节点
-            for child in node.children:
-                self._check_condition_node(child, tables, table_aliases)
-                
-        elif node.node_type == "COMPARISON":
-            # 检查比较操作
-            left = next((c for c in node.children if c.node_type == "LEFT"), None)
-            right = next((c for c in node.children if c.node_type == "RIGHT"), None)
-            
-            if left and not self._column_exists_in_tables_with_aliases(tables, left.value, table_aliases):
-                raise SemanticError("ColumnError", left.value, "WHERE 子句中的列不存在")
-            
-            # 检查右侧如果是列名
-            if right and not str(right.value).replace(".", "").isdigit():
-                # 如果不是数字，检查是否是列名
-                if "." in str(right.value) or any(table for table in tables if right.value in self.catalog.tables.get(table, {})):
-                    if not self._column_exists_in_tables_with_aliases(tables, right.value, table_aliases):
-                        # 如果看起来像列名但不存在，可能是字符串常量，允许通过
-                        pass
-                        
-        elif node.node_type == "BETWEEN":
-            # 检查 BETWEEN 操作
-            left = next((c for c in node.children if c.node_type == "LEFT"), None)
-            if left and not self._column_exists_in_tables_with_aliases(tables, left.value, table_aliases):
-                raise SemanticError("ColumnError", left.value, "BETWEEN 子句中的列不存在")
-                
-        elif node.node_type == "IN":
-            # 检查 IN 操作
-            left = next((c for c in node.children if c.node_type == "LEFT"), None)
-            if left and not self._column_exists_in_tables_with_aliases(tables, left.value, table_aliases):
-                raise SemanticError("ColumnError", left.value, "IN 子句中的列不存在")
-                
-        elif node.node_type == "LIKE":
-            # 检查 LIKE 操作
-            left = next((c for c in node.children if c.node_type == "LEFT"), None)
-            if left and not self._column_exists_in_tables_with_aliases(tables, left.value, table_aliases):
-                raise SemanticError("ColumnError", left.value, "LIKE 子句中的列不存在")
-        
-        # 兼容旧格式的WHERE节点 (LEFT, OP, RIGHT)
-        elif hasattr(node, 'children'):
-            left = next((c for c in node.children if c.node_type == "LEFT"), None)
-            right = next((c for c in node.children if c.node_type == "RIGHT"), None)
-            
-            if left and hasattr(left, 'value'):
-                if not self._column_exists_in_tables_with_aliases(tables, left.value, table_aliases):
-                    raise SemanticError("ColumnError", left.value, "WHERE 子句中的列不存在")
+    def _check_condition_node(self, node, tables, resolver):
+        """检查条件树（显式栈迭代遍历，避免长 AND/OR 链的递归调用开销和递归深度限制）"""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            node_type = current.node_type
+            if node_type is _LOGICAL_OP:
+                # 逆序入栈，保持与递归遍历相同的从左到右检查顺序
+                stack.extend(reversed(current.children))
+                continue
+            if not current.children:
+                # 叶子节点（如旧格式 WHERE 直接挂的 LEFT/OP/RIGHT）没有可检查的操作数
+                continue
 
-    def _check_aggregate_function(self, func_node, tables, table_aliases):
+            # 各类谓词都只关心 LEFT/RIGHT 子节点：一次遍历取出
+            left, right = self._operands(current)
+            if node_type is _COMPARISON:
+                self._check_comparison_predicate(left, right, tables, resolver)
+            else:
+                # BETWEEN / IN / LIKE 以及旧格式的 (LEFT, OP, RIGHT) 节点只需检查左侧列
+                message = _PREDICATE_COLUMN_MESSAGES.get(node_type, "WHERE 子句中的列不存在")
+                if left and not self._column_exists_in_tables_with_aliases(tables, left.value, resolver):
+                    raise SemanticError("ColumnError", left.value, message)
+
+    def _check_comparison_predicate(self, left, right, tables, resolver):
+        """检查比较谓词"""
+        if left and not self._column_exists_in_tables_with_aliases(tables, left.value, resolver):
+            raise SemanticError("ColumnError", left.value, "WHERE 子句中的列不存在")
+
+        # 右侧不做检查：数值、字符串常量直接通过；看起来像列名但不存在的值
+        # 也可能是未加引号的字符串常量，同样允许通过
+
+    def _check_aggregate_function(self, func_node, tables, resolver):
         """检查聚合函数的语义正确性"""
         try:
             func_name = func_node.value
-            arg_node = next((c for c in func_node.children if c.node_type == "ARG"), None)
+            arg_node = None
+            for child in func_node.children:
+                if child.node_type is _ARG:
+                    arg_node = child
+                    break
             
             if not arg_node:
                 raise SemanticError("AggregateError", func_name, f"聚合函数 {func_name} 缺少参数")
@@ -784,49 +1020,39 @@ class SemanticAnalyzer:
             
             # COUNT(*) 是特殊情况，无需检查列存在性
             if func_name == "COUNT" and arg_value == "*":
-                print(f"[OK] 聚合函数 {func_name}(*) 语义检查通过")
+                if logger.isEnabledFor(self._log_level):
+                    logger.log(self._log_level, f"[OK] 聚合函数 {func_name}(*) 语义检查通过")
                 return
             
             # 处理 DISTINCT 修饰符
-            if isinstance(arg_value, str) and arg_value.startswith("DISTINCT "):
-                actual_column = arg_value[9:]  # 去掉 "DISTINCT " 前缀
-            else:
-                actual_column = arg_value
+            actual_column = arg_value.removeprefix("DISTINCT ") if isinstance(arg_value, str) else arg_value
             
             # 检查列是否存在（仅对非*参数）
             if actual_column != "*":
-                if not self._column_exists_in_tables_with_aliases(tables, actual_column, table_aliases):
-                    raise SemanticError(
-                        "ColumnError", actual_column, f"聚合函数 {func_name} 中的列不存在",
-                        available_tables=self._get_available_tables(),
-                        available_columns=self._get_available_columns()
-                    )
+                if not self._column_exists_in_tables_with_aliases(tables, actual_column, resolver):
+                    raise self._error("ColumnError", actual_column, f"聚合函数 {func_name} 中的列不存在")
                 
                 # 检查数据类型兼容性
                 if func_name in ["SUM", "AVG"]:
-                    # SUM 和 AVG 只能用于数值列
-                    for table in tables:
-                        if self.catalog.has_column(table, actual_column):
-                            col_type = self.catalog.get_column_type(table, actual_column)
-                            if col_type not in ["INT", "DOUBLE", "FLOAT"]:
-                                raise SemanticError(
-                                    "TypeError", actual_column, 
-                                    f"聚合函数 {func_name} 不能用于非数值类型列 ({col_type})",
-                                    available_tables=self._get_available_tables(),
-                                    available_columns=self._get_available_columns()
-                                )
-                            break
+                    # SUM 和 AVG 只能用于数值列；通过列倒排索引定位所属表（按 FROM 顺序取第一个）
+                    owners = self.catalog.tables_containing_column(actual_column)
+                    table = next((t for t in tables if t in owners), None) if owners else None
+                    if table is not None:
+                        col_type = self.catalog.tables[table][actual_column]
+                        if col_type not in _NUMERIC_TYPES:
+                            raise self._error(
+                                "TypeError", actual_column, 
+                                f"聚合函数 {func_name} 不能用于非数值类型列 ({col_type})"
+                            )
             
-            print(f"[OK] 聚合函数 {func_name}({arg_value}) 语义检查通过")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] 聚合函数 {func_name}({arg_value}) 语义检查通过")
             
-        except Exception as e:
-            # 如果检查过程中出现任何错误，提供更详细的错误信息
-            print(f"[DEBUG] 聚合函数检查出错: {e}")
-            print(f"[DEBUG] func_node类型: {type(func_node)}")
-            print(f"[DEBUG] func_node内容: {func_node}")
-            if hasattr(func_node, 'children'):
-                print(f"[DEBUG] func_node.children: {func_node.children}")
-            raise e
+        except SemanticError as e:
+            # 只在开启 DEBUG 日志时才格式化节点信息
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("聚合函数检查出错: %s, func_node=%r, children=%r", e, func_node, func_node.children)
+            raise
 
     def _check_drop(self, ast):
         """检查 DROP TABLE 语句"""
@@ -834,55 +1060,52 @@ class SemanticAnalyzer:
         
         # 检查表是否存在
         if not self.catalog.has_table(table_name):
-            raise SemanticError(
-                "TableError", table_name, "要删除的表不存在",
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+            raise self._error("TableError", table_name, "要删除的表不存在")
         
-        # 检查是否有其他表引用此表作为外键
-        for other_table, fks in self.catalog.foreign_keys.items():
-            if other_table != table_name:
-                for fk in fks:
-                    if fk.get('references_table') == table_name:
-                        raise SemanticError(
-                            "ForeignKeyError", table_name, 
-                            f"无法删除表，被表 {other_table} 的外键约束引用",
-                            available_tables=self._get_available_tables(),
-                            available_columns=self._get_available_columns()
-                        )
+        # 检查是否有其他表引用此表作为外键（反向索引，只看引用本表的外键）
+        blockers = self.catalog.get_referencing_foreign_keys(table_name)
+        if blockers:
+            raise self._error(
+                "ForeignKeyError", table_name, 
+                f"无法删除表，被表 {blockers[0][0]} 的外键约束引用"
+            )
         
         # 执行删除操作
         try:
             self.catalog.drop_table(table_name)
-            print(f"[OK] DROP TABLE {table_name} 语义检查通过")
-            print(f"    表 {table_name} 已从目录中删除")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] DROP TABLE {table_name} 语义检查通过")
+                logger.log(self._log_level, f"    表 {table_name} 已从目录中删除")
         except SemanticError as e:
-            # 重新抛出带有上下文的错误
-            raise SemanticError(
-                e.error_type, e.position, e.message,
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+            # 补上诊断上下文后原样抛出
+            self._attach_context(e)
+            raise
 
     def _check_transaction_statement(self, ast):
         """检查事务控制语句（目前仅通过）"""
-        print(f"[OK] {ast.node_type} 语义检查通过")
-    
-    def _check_index_statement(self, ast):
-        """检查索引语句的语义正确性"""
-        if ast.node_type == "CREATE_INDEX":
-            self._check_create_index(ast)
-        elif ast.node_type == "DROP_INDEX":
-            self._check_drop_index(ast)
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, f"[OK] {ast.node_type} 语义检查通过")
     
     def _check_create_index(self, ast):
         """检查 CREATE INDEX 语句"""
         index_name = ast.value
         
-        # 获取表名和列名
-        table_node = next((c for c in ast.children if c.node_type == "TABLE"), None)
-        columns_node = next((c for c in ast.children if c.node_type == "COLUMNS"), None)
+        # 获取表名、列名、索引类型和唯一性标记（一次遍历，各取第一个）
+        table_node = columns_node = type_node = unique_node = None
+        for child in ast.children:
+            node_type = child.node_type
+            if node_type is _TABLE:
+                if table_node is None:
+                    table_node = child
+            elif node_type is _COLUMNS:
+                if columns_node is None:
+                    columns_node = child
+            elif node_type is _TYPE:
+                if type_node is None:
+                    type_node = child
+            elif node_type is _UNIQUE:
+                if unique_node is None:
+                    unique_node = child
         
         if not table_node:
             raise SemanticError("IndexError", index_name, "CREATE INDEX 语句缺少表名")
@@ -891,45 +1114,46 @@ class SemanticAnalyzer:
             raise SemanticError("IndexError", index_name, "CREATE INDEX 语句缺少列名")
         
         table_name = table_node.value
-        column_names = columns_node.value.split(",")
+        column_names = columns_node.value  # 解析器已给出列名元组
+        
+        # 先检查空列名和重复列名，避免无意义的目录查询
+        seen_columns = set()
+        for col_name in column_names:
+            if not col_name:
+                raise SemanticError("IndexError", index_name, f"索引 '{index_name}' 包含空列名")
+            if col_name in seen_columns:
+                raise SemanticError("IndexError", index_name, f"索引 '{index_name}' 包含重复列名 '{col_name}'")
+            seen_columns.add(col_name)
         
         # 检查表是否存在
         if not self.catalog.has_table(table_name):
-            raise SemanticError(
-                "TableError", table_name, f"索引 '{index_name}' 引用的表 '{table_name}' 不存在",
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+            raise self._error("TableError", table_name, f"索引 '{index_name}' 引用的表 '{table_name}' 不存在")
         
         # 检查所有列是否存在
         for col_name in column_names:
-            col_name = col_name.strip()
             if not self.catalog.has_column(table_name, col_name):
-                raise SemanticError(
+                raise self._error(
                     "ColumnError", col_name, 
-                    f"索引 '{index_name}' 引用的列 '{col_name}' 在表 '{table_name}' 中不存在",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
+                    f"索引 '{index_name}' 引用的列 '{col_name}' 在表 '{table_name}' 中不存在"
                 )
         
         # 检查索引类型
-        type_node = next((c for c in ast.children if c.node_type == "TYPE"), None)
         if type_node and type_node.value not in ["BTREE", "HASH"]:
             raise SemanticError(
                 "IndexError", index_name, f"不支持的索引类型: {type_node.value}"
             )
         
         # 检查唱一性约束
-        unique_node = next((c for c in ast.children if c.node_type == "UNIQUE"), None)
         is_unique = unique_node is not None
         
-        print(f"[OK] CREATE INDEX {index_name} 语义检查通过")
-        if is_unique:
-            print(f"    索引类型: 唯一索引")
-        print(f"    表: {table_name}")
-        print(f"    列: {', '.join(column_names)}")
-        if type_node:
-            print(f"    索引类型: {type_node.value}")
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, f"[OK] CREATE INDEX {index_name} 语义检查通过")
+            if is_unique:
+                logger.log(self._log_level, "    索引类型: 唯一索引")
+            logger.log(self._log_level, f"    表: {table_name}")
+            logger.log(self._log_level, f"    列: {', '.join(column_names)}")
+            if type_node:
+                logger.log(self._log_level, f"    索引类型: {type_node.value}")
     
     def _check_drop_index(self, ast):
         """检查 DROP INDEX 语句"""
@@ -938,24 +1162,36 @@ class SemanticAnalyzer:
         # 目前暂时不检查索引是否存在（需要索引元数据管理）
         # 未来可以扩展 catalog 来管理索引信息
         
-        print(f"[OK] DROP INDEX {index_name} 语义检查通过")
-    
-    def _check_trigger_statement(self, ast):
-        """检查触发器语句的语义正确性"""
-        if ast.node_type == "CREATE_TRIGGER":
-            self._check_create_trigger(ast)
-        elif ast.node_type == "DROP_TRIGGER":
-            self._check_drop_trigger(ast)
-    
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, f"[OK] DROP INDEX {index_name} 语义检查通过")
+
     def _check_create_trigger(self, ast):
         """检查 CREATE TRIGGER 语句"""
         trigger_name = ast.value
         
-        # 获取触发器相关信息
-        timing_node = next((c for c in ast.children if c.node_type == "TIMING"), None)
-        events_node = next((c for c in ast.children if c.node_type == "EVENTS"), None)
-        table_node = next((c for c in ast.children if c.node_type == "TABLE"), None)
-        for_each_row_node = next((c for c in ast.children if c.node_type == "FOR_EACH_ROW"), None)
+        # 获取触发器相关信息（一次遍历，各取第一个）
+        timing_node = events_node = table_node = for_each_row_node = None
+        when_condition = trigger_body = None
+        for child in ast.children:
+            node_type = child.node_type
+            if node_type is _TIMING:
+                if timing_node is None:
+                    timing_node = child
+            elif node_type is _EVENTS:
+                if events_node is None:
+                    events_node = child
+            elif node_type is _TABLE:
+                if table_node is None:
+                    table_node = child
+            elif node_type is _FOR_EACH_ROW:
+                if for_each_row_node is None:
+                    for_each_row_node = child
+            elif node_type is _WHEN_CONDITION:
+                if when_condition is None:
+                    when_condition = child
+            elif node_type is _TRIGGER_BODY:
+                if trigger_body is None:
+                    trigger_body = child
         
         if not timing_node:
             raise SemanticError("TriggerError", trigger_name, "CREATE TRIGGER 语句缺少触发时机")
@@ -967,50 +1203,40 @@ class SemanticAnalyzer:
             raise SemanticError("TriggerError", trigger_name, "CREATE TRIGGER 语句缺少表名")
         
         timing = timing_node.value
-        events = events_node.value.split(",")
+        events = events_node.value  # 解析器已给出事件元组
         table_name = table_node.value
         for_each_row = for_each_row_node.value == "True" if for_each_row_node else False
         
         # 检查表是否存在
         if not self.catalog.has_table(table_name):
-            raise SemanticError(
-                "TableError", table_name, f"触发器 '{trigger_name}' 引用的表 '{table_name}' 不存在",
-                available_tables=self._get_available_tables(),
-                available_columns=self._get_available_columns()
-            )
+            raise self._error("TableError", table_name, f"触发器 '{trigger_name}' 引用的表 '{table_name}' 不存在")
         
         # 检查触发时机是否有效
-        valid_timings = ["BEFORE", "AFTER", "INSTEAD OF"]
-        if timing not in valid_timings:
+        if timing not in _VALID_TIMINGS:
             raise SemanticError(
                 "TriggerError", trigger_name, f"不支持的触发时机: {timing}"
             )
         
         # 检查触发事件是否有效
-        valid_events = ["INSERT", "UPDATE", "DELETE"]
-        for event in events:
-            event = event.strip()
-            if event not in valid_events:
-                raise SemanticError(
-                    "TriggerError", trigger_name, f"不支持的触发事件: {event}"
-                )
-        
-        # 检查 WHEN 条件（如果存在）
-        when_condition = next((c for c in ast.children if c.node_type == "WHEN_CONDITION"), None)
-        if when_condition:
-            self._check_trigger_when_condition(when_condition, table_name)
+        if not _VALID_EVENTS.issuperset(events):
+            # 报告第一个无效事件
+            event = next(e for e in events if e not in _VALID_EVENTS)
+            raise SemanticError(
+                "TriggerError", trigger_name, f"不支持的触发事件: {event}"
+            )
         
-        # 检查触发器主体
-        trigger_body = next((c for c in ast.children if c.node_type == "TRIGGER_BODY"), None)
-        if trigger_body:
-            self._check_trigger_body(trigger_body, table_name)
+        # WHEN 条件与触发器主体在一次遍历中检查（各取第一个，WHEN 在前）
+        parts = [node for node in (when_condition, trigger_body) if node]
+        if parts:
+            self._walk_trigger(parts, table_name)
         
-        print(f"[OK] CREATE TRIGGER {trigger_name} 语义检查通过")
-        print(f"    触发时机: {timing}")
-        print(f"    触发事件: {', '.join(events)}")
-        print(f"    目标表: {table_name}")
-        if for_each_row:
-            print(f"    类型: 行级触发器")
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, f"[OK] CREATE TRIGGER {trigger_name} 语义检查通过")
+            logger.log(self._log_level, f"    触发时机: {timing}")
+            logger.log(self._log_level, f"    触发事件: {', '.join(events)}")
+            logger.log(self._log_level, f"    目标表: {table_name}")
+            if for_each_row:
+                logger.log(self._log_level, "    类型: 行级触发器")
     
     def _check_drop_trigger(self, ast):
         """检查 DROP TRIGGER 语句"""
@@ -1019,55 +1245,70 @@ class SemanticAnalyzer:
         # 目前暂时不检查触发器是否存在（需要触发器元数据管理）
         # 未来可以扩展 catalog 来管理触发器信息
         
-        print(f"[OK] DROP TRIGGER {trigger_name} 语义检查通过")
-    
-    def _check_trigger_when_condition(self, when_condition, table_name):
-        """检查触发器 WHEN 条件"""
-        # 检查条件中引用的列是否存在
-        for child in when_condition.children:
-            if child.node_type in ["LEFT", "RIGHT"]:
-                operand = child.value
-                if "." in operand:
-                    # OLD.column 或 NEW.column
-                    prefix, column = operand.split(".", 1)
-                    if prefix.upper() in ["OLD", "NEW"]:
-                        if not self.catalog.has_column(table_name, column):
-                            raise SemanticError(
-                                "ColumnError", column,
-                                f"触发器条件中引用的列 '{column}' 在表 '{table_name}' 中不存在",
-                                available_tables=self._get_available_tables(),
-                                available_columns=self._get_available_columns()
-                            )
-    
-    def _check_trigger_body(self, trigger_body, table_name):
-        """检查触发器主体"""
-        # 简化检查：确保触发器主体不为空
-        if not trigger_body.children:
-            raise SemanticError(
-                "TriggerError", "trigger_body", "触发器主体不能为空"
-            )
-        
-        # 递归检查触发器主体中的语句
-        for stmt in trigger_body.children:
-            if stmt.node_type in ["INSERT", "UPDATE", "DELETE", "SELECT"]:
-                # 对于触发器内部的 SQL 语句，进行递归检查。
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, f"[OK] DROP TRIGGER {trigger_name} 语义检查通过")
+
+    def _walk_trigger(self, nodes, table_name):
+        """
+        单次遍历触发器的 WHEN 条件和主体（显式栈）：
+        WHEN 条件中的 OLD/NEW 列引用就地检查，主体中的 DML 语句交给对应的语句检查器。
+        """
+        stack = list(reversed(nodes))
+        while stack:
+            node = stack.pop()
+            node_type = node.node_type
+            if node_type is _WHEN_CONDITION:
+                # 只检查 WHEN 条件的直接 LEFT/RIGHT 操作数
+                stack.extend(
+                    child for child in reversed(node.children)
+                    if child.node_type is _LEFT or child.node_type is _RIGHT
+                )
+            elif node_type is _LEFT or node_type is _RIGHT:
+                self._check_trigger_operand(node.value, table_name)
+            elif node_type is _TRIGGER_BODY:
+                # 简化检查：确保触发器主体不为空
+                if not node.children:
+                    raise SemanticError(
+                        "TriggerError", "trigger_body", "触发器主体不能为空"
+                    )
+                stack.extend(
+                    stmt for stmt in reversed(node.children)
+                    if stmt.node_type in self._TRIGGER_BODY_STATEMENTS
+                )
+            else:
+                # 对于触发器内部的 SQL 语句，交给语句检查器检查。
                 # 为了让仅编译器阶段顺利通过，对于表不存在等运行期依赖问题，降级为警告。
                 try:
-                    self._analyze_node(stmt)
+                    self._analyze_node(node)
                 except SemanticError as e:
                     if getattr(e, 'error_type', '') in ("TableError",):
-                        print(f"[WARN] 触发器主体内语句跳过严格检查：{e}")
+                        if logger.isEnabledFor(self._log_level):
+                            logger.log(self._log_level, f"[WARN] 触发器主体内语句跳过严格检查：{e}")
                         continue
                     raise
-            # 其他语句类型暂时跳过检查
+
+    # 触发器主体中需要检查的语句类型，其他语句类型暂时跳过检查
+    _TRIGGER_BODY_STATEMENTS = frozenset(["INSERT", "UPDATE", "DELETE", "SELECT"])
+
+    def _check_trigger_operand(self, operand, table_name):
+        """检查 WHEN 条件操作数中的 OLD.column / NEW.column 引用"""
+        prefix, dot, column = operand.partition(".")
+        if not dot or prefix.upper() not in _TRIGGER_ROW_PREFIXES:
+            return
+        if not self.catalog.has_column(table_name, column):
+            raise self._error(
+                "ColumnError", column,
+                f"触发器条件中引用的列 '{column}' 在表 '{table_name}' 中不存在"
+            )
     
     def _check_view_statement(self, ast):
         """检查视图语句（CREATE VIEW / DROP VIEW）"""
         node_type = ast.node_type
         view_name = ast.value
         
-        if node_type == "CREATE_VIEW":
-            print(f"[OK] CREATE VIEW {view_name} 语义检查通过")
+        if node_type is _CREATE_VIEW:
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] CREATE VIEW {view_name} 语义检查通过")
             
             # 提取视图信息
             materialized = False
@@ -1075,11 +1316,11 @@ class SemanticAnalyzer:
             query = None
             
             for child in ast.children:
-                if child.node_type == "MATERIALIZED":
+                if child.node_type is _MATERIALIZED:
                     materialized = child.value == "True"
-                elif child.node_type == "COLUMNS":
-                    columns = child.value.split(",") if child.value else []
-                elif child.node_type == "QUERY":
+                elif child.node_type is _COLUMNS:
+                    columns = list(child.value)  # 解析器已给出列名元组
+                elif child.node_type is _QUERY:
                     query = child.children[0] if child.children else None
             
             # 检查查询语句的语义
@@ -1088,9 +1329,9 @@ class SemanticAnalyzer:
                 # 如果没有显式指定列名，从查询中推导列信息
                 if not columns:
                     # 从 SELECT 语句中提取列信息
-                    if query.node_type == "SELECT":
+                    if query.node_type is _SELECT:
                         for col_child in query.children:
-                            if col_child.node_type == "COLUMN":
+                            if col_child.node_type is _COLUMN:
                                 columns.append(col_child.value)
             
             # 推导视图的列类型（简化处理）
@@ -1100,38 +1341,45 @@ class SemanticAnalyzer:
             
             # 创建视图
             self.catalog.create_view(view_name, view_columns, query, materialized)
-            print(f"    视图类型: {'物化视图' if materialized else '普通视图'}")
-            print(f"    列数: {len(columns)}")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"    视图类型: {'物化视图' if materialized else '普通视图'}")
+                logger.log(self._log_level, f"    列数: {len(columns)}")
             
-        elif node_type == "DROP_VIEW":
-            print(f"[OK] DROP VIEW {view_name} 语义检查通过")
+        elif node_type is _DROP_VIEW:
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] DROP VIEW {view_name} 语义检查通过")
             
             # 检查视图是否存在
             if not self.catalog.has_view(view_name):
                 # 检查是否有 IF EXISTS 子句
                 if_exists = False
                 for child in ast.children:
-                    if child.node_type == "IF_EXISTS" and child.value == "TRUE":
+                    if child.node_type is _IF_EXISTS and child.value == "TRUE":
                         if_exists = True
                         break
                 
                 if not if_exists:
                     raise SemanticError("ViewError", view_name, "要删除的视图不存在")
                 else:
-                    print(f"    [WARN] 视图 {view_name} 不存在，但使用了 IF EXISTS，忽略")
+                    if logger.isEnabledFor(self._log_level):
+                        logger.log(self._log_level, f"    [WARN] 视图 {view_name} 不存在，但使用了 IF EXISTS，忽略")
                     return
             
             # 删除视图
             self.catalog.drop_view(view_name)
 
+    _CREATE_PROCEDURE_TYPES = frozenset(["CREATE_PROCEDURE", "CREATE_FUNCTION"])
+    _DROP_PROCEDURE_TYPES = frozenset(["DROP_PROCEDURE", "DROP_FUNCTION"])
+
     def _check_procedure_statement(self, ast):
         """检查存储过程语句（CREATE PROCEDURE/FUNCTION, DROP PROCEDURE/FUNCTION, CALL）"""
         node_type = ast.node_type
         proc_name = ast.value
         
-        if node_type in ["CREATE_PROCEDURE", "CREATE_FUNCTION"]:
-            is_function = node_type == "CREATE_FUNCTION"
-            print(f"[OK] {'CREATE FUNCTION' if is_function else 'CREATE PROCEDURE'} {proc_name} 语义检查通过")
+        if node_type in self._CREATE_PROCEDURE_TYPES:
+            is_function = node_type is _CREATE_FUNCTION
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] {'CREATE FUNCTION' if is_function else 'CREATE PROCEDURE'} {proc_name} 语义检查通过")
             
             # 提取存储过程信息
             parameters = []
@@ -1139,10 +1387,10 @@ class SemanticAnalyzer:
             body = []
             
             for child in ast.children:
-                if child.node_type == "PARAMETERS":
+                if child.node_type is _PARAMETERS:
                     for param_child in child.children:
-                        if param_child.node_type == "PARAMETER":
-                            param_parts = param_child.value.split(":")
+                        if param_child.node_type is _PARAMETER:
+                            param_parts = param_child.value.split(":", 2)  # name:type[:mode]
                             param_name = param_parts[0]
                             param_type = param_parts[1]
                             param_mode = param_parts[2] if len(param_parts) > 2 else "IN"
@@ -1151,15 +1399,17 @@ class SemanticAnalyzer:
                                 'type': param_type,
                                 'mode': param_mode
                             })
-                elif child.node_type == "RETURN_TYPE":
+                elif child.node_type is _RETURN_TYPE:
                     return_type = child.value
-                elif child.node_type == "PROCEDURE_BODY":
-                    # 设置参数和局部变量作用域
-                    old_params = self.current_procedure_params.copy()
-                    old_vars = self.current_local_vars.copy()
-                    
-                    for param in parameters:
-                        self.current_procedure_params[param['name']] = param['type']
+                elif child.node_type is _PROCEDURE_BODY:
+                    # 设置参数和局部变量作用域：在外层作用域之上叠加一层，
+                    # 过程体内的新增/覆盖只写入这一层，退出时丢弃即可，无需复制外层字典
+                    old_params = self.current_procedure_params
+                    old_vars = self.current_local_vars
+                    self.current_procedure_params = ChainMap(
+                        {param['name']: param['type'] for param in parameters}, old_params
+                    )
+                    self.current_local_vars = ChainMap({}, old_vars)
                     
                     # 检查过程体内的语句
                     try:
@@ -1168,7 +1418,8 @@ class SemanticAnalyzer:
                                 self._analyze_node(stmt)
                                 body.append(stmt)
                             except SemanticError as e:
-                                print(f"[WARN] 存储过程体内语句跳过严格检查：{e}")
+                                if logger.isEnabledFor(self._log_level):
+                                    logger.log(self._log_level, f"[WARN] 存储过程体内语句跳过严格检查：{e}")
                                 body.append(stmt)  # 仍然保留语句
                     finally:
                         # 恢复参数和局部变量作用域
@@ -1181,27 +1432,30 @@ class SemanticAnalyzer:
             
             # 创建存储过程
             self.catalog.create_procedure(proc_name, parameters, body, return_type, is_function)
-            print(f"    参数数量: {len(parameters)}")
-            if return_type:
-                print(f"    返回类型: {return_type}")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"    参数数量: {len(parameters)}")
+                if return_type:
+                    logger.log(self._log_level, f"    返回类型: {return_type}")
             
-        elif node_type in ["DROP_PROCEDURE", "DROP_FUNCTION"]:
-            is_function = node_type == "DROP_FUNCTION"
-            print(f"[OK] {'DROP FUNCTION' if is_function else 'DROP PROCEDURE'} {proc_name} 语义检查通过")
+        elif node_type in self._DROP_PROCEDURE_TYPES:
+            is_function = node_type is _DROP_FUNCTION
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] {'DROP FUNCTION' if is_function else 'DROP PROCEDURE'} {proc_name} 语义检查通过")
             
             # 检查存储过程是否存在
             if not self.catalog.has_procedure(proc_name):
                 # 检查是否有 IF EXISTS 子句
                 if_exists = False
                 for child in ast.children:
-                    if child.node_type == "IF_EXISTS" and child.value == "TRUE":
+                    if child.node_type is _IF_EXISTS and child.value == "TRUE":
                         if_exists = True
                         break
                 
                 if not if_exists:
                     raise SemanticError("ProcedureError", proc_name, "要删除的存储过程不存在")
                 else:
-                    print(f"    [WARN] 存储过程 {proc_name} 不存在，但使用了 IF EXISTS，忽略")
+                    if logger.isEnabledFor(self._log_level):
+                        logger.log(self._log_level, f"    [WARN] 存储过程 {proc_name} 不存在，但使用了 IF EXISTS，忽略")
                     return
             
             # 验证类型匹配
@@ -1215,8 +1469,9 @@ class SemanticAnalyzer:
             # 删除存储过程
             self.catalog.drop_procedure(proc_name)
             
-        elif node_type == "CALL_PROCEDURE":
-            print(f"[OK] CALL {proc_name} 语义检查通过")
+        elif node_type is _CALL_PROCEDURE:
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] CALL {proc_name} 语义检查通过")
             
             # 检查存储过程是否存在
             if not self.catalog.has_procedure(proc_name):
@@ -1229,8 +1484,8 @@ class SemanticAnalyzer:
             # 提取调用参数
             call_args = []
             for child in ast.children:
-                if child.node_type == "ARGUMENTS":
-                    call_args = child.value.split(",") if child.value else []
+                if child.node_type is _ARGUMENTS:
+                    call_args = child.value  # 解析器已给出参数元组
                     break
             
             actual_params = len(call_args)
@@ -1238,23 +1493,23 @@ class SemanticAnalyzer:
                 raise SemanticError("ProcedureError", proc_name, 
                                   f"参数数量不匹配：期望 {expected_params} 个，实际 {actual_params} 个")
             
-            print(f"    参数数量: {actual_params}")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"    参数数量: {actual_params}")
 
     def _check_delimiter_statement(self, ast):
         """检查 DELIMITER 语句"""
         delimiter = ast.value
-        print(f"[OK] DELIMITER 语句语义检查通过")
-        print(f"    新分隔符: '{delimiter}'")
+        if logger.isEnabledFor(self._log_level):
+            logger.log(self._log_level, "[OK] DELIMITER 语句语义检查通过")
+            logger.log(self._log_level, f"    新分隔符: '{delimiter}'")
     
-    def _check_expression_columns(self, expression, tables, table_aliases):
+    def _check_expression_columns(self, expression, tables, resolver):
         """检查表达式中的列是否存在"""
-        import re
-        
-        # 提取表达式中的标识符（可能的列名）
-        # 匹配标识符，但排除数字常量
-        identifiers = re.findall(r'\b[a-zA-Z_][a-zA-Z0-9_]*\b', str(expression))
-        
-        for identifier in identifiers:
+        if not isinstance(expression, str):
+            expression = str(expression)
+
+        # 提取表达式中的标识符（可能的列名），数字常量不会被匹配
+        for identifier in _find_identifiers(expression):
             # 跳过存储过程参数
             if identifier in self.current_procedure_params:
                 continue
@@ -1264,45 +1519,68 @@ class SemanticAnalyzer:
                 continue
                 
             # 检查是否是列名
-            if not self._column_exists_in_tables_with_aliases(tables, identifier, table_aliases):
+            if not self._column_exists_in_tables_with_aliases(tables, identifier, resolver):
                 # 如果不是列名，可能是常量或函数，暂时跳过
                 # 只有当它看起来像列名时才报错
                 if not identifier.replace('.', '').replace('_', '').isalnum():
                     continue
                     
                 # 检查是否是常见的SQL函数或关键字
-                sql_functions = {'NOW', 'COUNT', 'SUM', 'AVG', 'MAX', 'MIN', 'UPPER', 'LOWER', 'LENGTH'}
-                if identifier.upper() in sql_functions:
+                if identifier.upper() in _SQL_FUNCTIONS:
                     continue
                     
-                raise SemanticError(
-                    "ColumnError", identifier, "列不存在于任何表中",
-                    available_tables=self._get_available_tables(),
-                    available_columns=self._get_available_columns()
-                )
+                raise self._error("ColumnError", identifier, "列不存在于任何表中")
     
     def _check_declare_statement(self, ast):
         """检查 DECLARE 语句"""
         # 解析变量声明：var_name:var_type
-        var_info = ast.value.split(":")
-        if len(var_info) >= 2:
-            var_name = var_info[0]
-            var_type = var_info[1]
+        var_name, sep, rest = ast.value.partition(":")
+        if sep:
+            var_type = rest.partition(":")[0]
             
             # 添加到局部变量作用域
             self.current_local_vars[var_name] = var_type
-            print(f"[OK] DECLARE {var_name} {var_type} 语义检查通过")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] DECLARE {var_name} {var_type} 语义检查通过")
     
     def _check_set_statement(self, ast):
         """检查 SET 语句"""
         # 解析赋值：var_name=expression
-        assignment = ast.value.split("=", 1)
-        if len(assignment) == 2:
-            var_name = assignment[0].strip()
-            expression = assignment[1].strip()
+        var_name, sep, expression = ast.value.partition("=")
+        if sep:
+            var_name = var_name.strip()
+            expression = expression.strip()
             
             # 检查变量是否存在（参数或局部变量）
             if var_name not in self.current_procedure_params and var_name not in self.current_local_vars:
                 raise SemanticError("VariableError", var_name, "变量未声明")
             
-            print(f"[OK] SET {var_name} 语义检查通过")
+            if logger.isEnabledFor(self._log_level):
+                logger.log(self._log_level, f"[OK] SET {var_name} 语义检查通过")
+
+    # 语句类型 -> 检查方法的分派表（同类语句共用一个检查入口）
+    _DISPATCH = {
+        "CREATE_TABLE": _check_create,
+        "INSERT": _check_insert,
+        "SELECT": _check_select,
+        "UPDATE": _check_update,
+        "DELETE": _check_delete,
+        "DROP_TABLE": _check_drop,
+        "BEGIN_TRANSACTION": _check_transaction_statement,
+        "COMMIT": _check_transaction_statement,
+        "ROLLBACK": _check_transaction_statement,
+        "CREATE_INDEX": _check_create_index,
+        "DROP_INDEX": _check_drop_index,
+        "CREATE_TRIGGER": _check_create_trigger,
+        "DROP_TRIGGER": _check_drop_trigger,
+        "CREATE_VIEW": _check_view_statement,
+        "DROP_VIEW": _check_view_statement,
+        "CREATE_PROCEDURE": _check_procedure_statement,
+        "CREATE_FUNCTION": _check_procedure_statement,
+        "DROP_PROCEDURE": _check_procedure_statement,
+        "DROP_FUNCTION": _check_procedure_statement,
+        "CALL_PROCEDURE": _check_procedure_statement,
+        "DECLARE_STATEMENT": _check_declare_statement,
+        "SET_STATEMENT": _check_set_statement,
+        "DELIMITER_STATEMENT": _check_delimiter_statement,
+    }
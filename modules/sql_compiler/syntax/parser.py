@@ -1,7 +1,21 @@
+import sys
 from modules.sql_compiler.lexical.lexer import Lexer, Token, ERROR_TYPES
 from modules.sql_compiler.rule.rules import KEYWORDS
 from modules.sql_compiler.semantic.semantic import SemanticAnalyzer, Catalog, SemanticError
 
+# 关键字集合（与词法单元的 lexeme_upper 做成员判断）
+_TABLE_CONSTRAINT_KEYWORDS = frozenset(("PRIMARY", "FOREIGN", "CONSTRAINT"))
+_COLUMN_CONSTRAINT_KEYWORDS = frozenset(("PRIMARY", "NOT", "UNIQUE"))
+_AGGREGATE_FUNCTIONS = frozenset(("COUNT", "SUM", "AVG", "MAX", "MIN"))
+# FROM 子句中表名/别名之后可能出现的子句起始关键字
+_FROM_BOUNDARY_KEYWORDS = frozenset(("JOIN", "INNER", "LEFT", "RIGHT", "WHERE", "GROUP", "ORDER"))
+_JOIN_START_KEYWORDS = frozenset(("JOIN", "INNER", "LEFT", "RIGHT"))
+_JOIN_TYPE_KEYWORDS = frozenset(("INNER", "LEFT", "RIGHT"))
+_TRIGGER_EVENT_KEYWORDS = frozenset(("INSERT", "UPDATE", "DELETE"))
+_PARAMETER_MODE_KEYWORDS = frozenset(("IN", "OUT", "INOUT"))
+# IF 语句中结束当前分支的关键字
+_IF_BRANCH_END_KEYWORDS = frozenset(("ELSEIF", "ELSE", "END"))
+
 # 尝试导入智能诊断模块
 try:
     from modules.sql_compiler.diagnostics.error_diagnostic import SmartErrorDiagnostic, ErrorFormatter
@@ -55,8 +69,11 @@ class ParseError(Exception):
 
 class ASTNode:
     """抽象语法树节点"""
+    # 固定字段布局：节点数量大、属性访问频繁，去掉实例 __dict__ 以节省内存并加快属性访问
+    __slots__ = ("node_type", "value", "children")
+
     def __init__(self, node_type, value=None, children=None):
-        self.node_type = node_type  # 例如 'CREATE_TABLE', 'INSERT'
+        self.node_type = sys.intern(node_type.upper())  # 例如 'CREATE_TABLE', 'INSERT'（统一为大写并驻留）
         self.value = value          # 节点值，如表名、列名
         self.children = children if children else []  # 子节点列表
 
@@ -67,6 +84,24 @@ class ASTNode:
             s += child.__repr__(level + 1)
         return s
 
+    def first_children(self):
+        """一次遍历返回 {node_type: 第一个该类型的子节点}，代替对 children 的多次线性查找"""
+        first = {}
+        for child in self.children:
+            first.setdefault(child.node_type, child)
+        return first
+
+    @staticmethod
+    def _condition_dict(node):
+        """将 (LEFT, OP, RIGHT) 形式的条件节点转换为字典"""
+        first = node.first_children()
+        left, op, right = first.get("LEFT"), first.get("OP"), first.get("RIGHT")
+        return {
+            "left": left.value if left else None,
+            "op": op.value if op else None,
+            "right": right.value if right else None,
+        }
+
     def to_dict(self):
         """将 AST 节点转换为字典格式，适配执行计划生成器"""
         result = {"type": self.node_type}
@@ -76,7 +111,7 @@ class ASTNode:
             columns = []
             for child in self.children:
                 if child.node_type == "COLUMN":
-                    col_name, col_type = child.value.split(":")
+                    col_name, col_type = child.value
                     columns.append({"name": col_name, "type": col_type})
             result["columns"] = columns
             
@@ -87,27 +122,25 @@ class ASTNode:
             
         elif self.node_type == "SELECT":
             result["columns"] = [child.value for child in self.children if child.node_type == "COLUMN"]
+            first = self.first_children()
             
             # 处理 INTO 子句
-            into_node = next((child for child in self.children if child.node_type == "INTO"), None)
+            into_node = first.get("INTO")
             result["into_variable"] = into_node.value if into_node else None
             
             # 处理 FROM 子句
-            from_node = next((child for child in self.children if child.node_type == "FROM"), None)
+            from_node = first.get("FROM")
             joins = []
             if from_node:
                 result["table"] = from_node.value
                 # 处理 JOIN
                 for join_child in from_node.children:
                     if join_child.node_type == "JOIN":
-                        join_table = next((c.value for c in join_child.children if c.node_type == "TABLE"), None)
-                        on_node = next((c for c in join_child.children if c.node_type == "ON"), None)
-                        on_condition = None
-                        if on_node:
-                            left = next((c.value for c in on_node.children if c.node_type == "LEFT"), None)
-                            op = next((c.value for c in on_node.children if c.node_type == "OP"), None)
-                            right = next((c.value for c in on_node.children if c.node_type == "RIGHT"), None)
-                            on_condition = {"left": left, "op": op, "right": right}
+                        join_first = join_child.first_children()
+                        join_table_node = join_first.get("TABLE")
+                        join_table = join_table_node.value if join_table_node else None
+                        on_node = join_first.get("ON")
+                        on_condition = self._condition_dict(on_node) if on_node else None
                         joins.append({
                             "type": join_child.value,
                             "table": join_table,
@@ -116,29 +149,23 @@ class ASTNode:
             result["joins"] = joins
             
             # 处理 WHERE 条件
-            where_node = next((child for child in self.children if child.node_type == "WHERE"), None)
-            if where_node:
-                left = next((c.value for c in where_node.children if c.node_type == "LEFT"), None)
-                op = next((c.value for c in where_node.children if c.node_type == "OP"), None)
-                right = next((c.value for c in where_node.children if c.node_type == "RIGHT"), None)
-                result["where"] = {"left": left, "op": op, "right": right}
-            else:
-                result["where"] = None
+            where_node = first.get("WHERE")
+            result["where"] = self._condition_dict(where_node) if where_node else None
             
             # 处理 GROUP BY
-            group_by_node = next((child for child in self.children if child.node_type == "GROUP_BY"), None)
+            group_by_node = first.get("GROUP_BY")
             if group_by_node:
                 result["group_by"] = [c.value for c in group_by_node.children if c.node_type == "COLUMN"]
             else:
                 result["group_by"] = None
             
             # 处理 ORDER BY
-            order_by_node = next((child for child in self.children if child.node_type == "ORDER_BY"), None)
+            order_by_node = first.get("ORDER_BY")
             if order_by_node:
                 order_by = []
                 for sort_child in order_by_node.children:
                     if sort_child.node_type == "SORT":
-                        col, direction = sort_child.value.split(":")
+                        col, direction = sort_child.value
                         order_by.append({"column": col, "direction": direction})
                 result["order_by"] = order_by
             else:
@@ -150,31 +177,19 @@ class ASTNode:
             assignments = {}
             for child in self.children:
                 if child.node_type == "ASSIGNMENT":
-                    col, val = child.value.split("=")
+                    col, val = child.value
                     assignments[col] = val
             result["assignments"] = assignments
             
             # 处理 WHERE 条件
-            where_node = next((child for child in self.children if child.node_type == "WHERE"), None)
-            if where_node:
-                left = next((c.value for c in where_node.children if c.node_type == "LEFT"), None)
-                op = next((c.value for c in where_node.children if c.node_type == "OP"), None)
-                right = next((c.value for c in where_node.children if c.node_type == "RIGHT"), None)
-                result["where"] = {"left": left, "op": op, "right": right}
-            else:
-                result["where"] = None
+            where_node = self.first_children().get("WHERE")
+            result["where"] = self._condition_dict(where_node) if where_node else None
                 
         elif self.node_type == "DELETE":
             result["table"] = self.value
             # 处理 WHERE 条件
-            where_node = next((child for child in self.children if child.node_type == "WHERE"), None)
-            if where_node:
-                left = next((c.value for c in where_node.children if c.node_type == "LEFT"), None)
-                op = next((c.value for c in where_node.children if c.node_type == "OP"), None)
-                right = next((c.value for c in where_node.children if c.node_type == "RIGHT"), None)
-                result["where"] = {"left": left, "op": op, "right": right}
-            else:
-                result["where"] = None
+            where_node = self.first_children().get("WHERE")
+            result["where"] = self._condition_dict(where_node) if where_node else None
                 
         elif self.node_type == "DROP_TABLE":
             result["table"] = self.value
@@ -188,7 +203,7 @@ class ASTNode:
                 if child.node_type == "MATERIALIZED":
                     result["materialized"] = child.value == "True"
                 elif child.node_type == "COLUMNS":
-                    result["columns"] = child.value.split(",") if child.value else []
+                    result["columns"] = list(child.value)
                 elif child.node_type == "QUERY":
                     result["query"] = child.children[0].to_dict() if child.children else None
         elif self.node_type == "DROP_VIEW":
@@ -236,7 +251,7 @@ class ASTNode:
             
             for child in self.children:
                 if child.node_type == "ARGUMENTS":
-                    result["arguments"] = child.value.split(",") if child.value else []
+                    result["arguments"] = list(child.value)
         else:
             # 默认格式，用于其他类型的节点
             result["value"] = self.value
@@ -265,7 +280,7 @@ class Parser:
         if self.current_token.type != token_type:
             context_info = f"{context}:expected_{token_type}_got_{self.current_token.type}"
             raise ParseError(f"Expected token type {token_type} but got {self.current_token.type}", self.current_token, context_info)
-        if lexeme and self.current_token.lexeme.upper() != lexeme.upper():
+        if lexeme and self.current_token.lexeme_upper != lexeme.upper():
             context_info = f"{context}:expected_{lexeme}_got_{self.current_token.lexeme}"
             raise ParseError(f"Expected '{lexeme}' but got '{self.current_token.lexeme}'", self.current_token, context_info)
         token = self.current_token
@@ -306,7 +321,7 @@ class Parser:
         ast_list = []
         while self.current_token:
             # 检查是否是 DELIMITER 语句
-            if self.current_token.lexeme.upper() == "DELIMITER":
+            if self.current_token.lexeme_upper == "DELIMITER":
                 delimiter_node = self.delimiter_statement()
                 ast_list.append(delimiter_node)
             else:
@@ -342,75 +357,33 @@ class Parser:
         # 返回 DELIMITER 节点
         return ASTNode("DELIMITER_STATEMENT", new_delimiter)
 
+    def _peek_upper(self, offset):
+        """返回当前位置之后第 offset 个词法单元的大写词素，越界时返回 None"""
+        idx = self.pos + offset
+        if idx < len(self.tokens):
+            return self.tokens[idx].lexeme_upper
+        return None
+
     def statement(self):
-        if self.current_token.lexeme.upper() == "CREATE":
-            # 检查是 CREATE TABLE 还是 CREATE INDEX
-            next_token_idx = self.pos + 1
-            if next_token_idx < len(self.tokens):
-                next_token = self.tokens[next_token_idx]
-                if next_token.lexeme.upper() == "INDEX":
-                    return self.create_index()
-                elif next_token.lexeme.upper() in ["UNIQUE"]:
-                    # 检查 CREATE UNIQUE INDEX
-                    unique_next_idx = self.pos + 2
-                    if unique_next_idx < len(self.tokens):
-                        unique_next_token = self.tokens[unique_next_idx]
-                        if unique_next_token.lexeme.upper() == "INDEX":
-                            return self.create_index()
-                    return self.create_table()
-                elif next_token.lexeme.upper() == "TRIGGER":
-                    return self.create_trigger()
-                elif next_token.lexeme.upper() == "VIEW":
-                    return self.create_view()
-                elif next_token.lexeme.upper() in ["PROCEDURE", "FUNCTION"]:
-                    return self.create_procedure()
-                elif next_token.lexeme.upper() == "MATERIALIZED":
-                    # 检查 CREATE MATERIALIZED VIEW
-                    mat_next_idx = self.pos + 2
-                    if mat_next_idx < len(self.tokens):
-                        mat_next_token = self.tokens[mat_next_idx]
-                        if mat_next_token.lexeme.upper() == "VIEW":
-                            return self.create_view()
-                    return self.create_table()
-                else:
-                    return self.create_table()
-            else:
-                return self.create_table()
-        elif self.current_token.lexeme.upper() == "INSERT":
-            return self.insert()
-        elif self.current_token.lexeme.upper() == "SELECT":
-            return self.select()
-        elif self.current_token.lexeme.upper() == "UPDATE":
-            return self.update()
-        elif self.current_token.lexeme.upper() == "DELETE":
-            return self.delete()
-        elif self.current_token.lexeme.upper() == "DROP":
-            # 检查是 DROP TABLE 还是 DROP INDEX
-            next_token_idx = self.pos + 1
-            if next_token_idx < len(self.tokens):
-                next_token = self.tokens[next_token_idx]
-                if next_token.lexeme.upper() == "INDEX":
-                    return self.drop_index()
-                elif next_token.lexeme.upper() == "TRIGGER":
-                    return self.drop_trigger()
-                elif next_token.lexeme.upper() == "VIEW":
-                    return self.drop_view()
-                elif next_token.lexeme.upper() in ["PROCEDURE", "FUNCTION"]:
-                    return self.drop_procedure()
+        keyword = self.current_token.lexeme_upper
+        if keyword == "CREATE":
+            # 按 CREATE 之后的关键字分派；UNIQUE/MATERIALIZED 还要看第三个关键字，其余情况按建表处理
+            next_keyword = self._peek_upper(1)
+            handler = self._CREATE_DISPATCH.get(next_keyword)
+            if handler is None:
+                modifier = self._CREATE_MODIFIERS.get(next_keyword)
+                if modifier is not None and self._peek_upper(2) == modifier[0]:
+                    handler = modifier[1]
                 else:
-                    return self.drop_table()
-            else:
-                return self.drop_table()
-        elif self.current_token.lexeme.upper() == "BEGIN":
-            return self.begin_transaction()
-        elif self.current_token.lexeme.upper() == "COMMIT":
-            return self.commit()
-        elif self.current_token.lexeme.upper() == "ROLLBACK":
-            return self.rollback()
-        elif self.current_token.lexeme.upper() == "CALL":
-            return self.call_procedure()
-        else:
+                    handler = Parser.create_table
+            return handler(self)
+        if keyword == "DROP":
+            # 按 DROP 之后的关键字分派，其余情况按删表处理
+            return self._DROP_DISPATCH.get(self._peek_upper(1), Parser.drop_table)(self)
+        handler = self._STATEMENT_DISPATCH.get(keyword)
+        if handler is None:
             raise ParseError(f"Unsupported statement beginning with '{self.current_token.lexeme}'", self.current_token)
+        return handler(self)
 
     def create_table(self):
         self.expect("KEYWORD", "CREATE")
@@ -426,9 +399,9 @@ class Parser:
         while True:
             # 检查是否是约束定义
             if (self.current_token and self.current_token.type == "KEYWORD" and 
-                self.current_token.lexeme.upper() in ["PRIMARY", "FOREIGN", "CONSTRAINT"]):
+                self.current_token.lexeme_upper in _TABLE_CONSTRAINT_KEYWORDS):
                 
-                if self.current_token.lexeme.upper() == "PRIMARY":
+                if self.current_token.lexeme_upper == "PRIMARY":
                     # 解析 PRIMARY KEY (col1, col2, ...)
                     self.advance()  # PRIMARY
                     self.expect("KEYWORD", "KEY")
@@ -442,7 +415,7 @@ class Parser:
                             break
                     self.expect("DELIMITER", ")")
                     
-                elif self.current_token.lexeme.upper() == "FOREIGN":
+                elif self.current_token.lexeme_upper == "FOREIGN":
                     # 解析 FOREIGN KEY (col) REFERENCES table(col)
                     self.advance()  # FOREIGN
                     self.expect("KEYWORD", "KEY")
@@ -468,20 +441,20 @@ class Parser:
                 # 检查列级约束
                 col_constraints = []
                 while (self.current_token and self.current_token.type == "KEYWORD" and 
-                       self.current_token.lexeme.upper() in ["PRIMARY", "NOT", "UNIQUE"]):
+                       self.current_token.lexeme_upper in _COLUMN_CONSTRAINT_KEYWORDS):
                     
-                    if self.current_token.lexeme.upper() == "PRIMARY":
+                    if self.current_token.lexeme_upper == "PRIMARY":
                         self.advance()
                         self.expect("KEYWORD", "KEY")
                         primary_keys.append(col_name)
                         col_constraints.append("PRIMARY_KEY")
                         
-                    elif self.current_token.lexeme.upper() == "NOT":
+                    elif self.current_token.lexeme_upper == "NOT":
                         self.advance()
                         self.expect("KEYWORD", "NULL")
                         col_constraints.append("NOT_NULL")
                         
-                    elif self.current_token.lexeme.upper() == "UNIQUE":
+                    elif self.current_token.lexeme_upper == "UNIQUE":
                         self.advance()
                         col_constraints.append("UNIQUE")
                 
@@ -502,18 +475,19 @@ class Parser:
             self.expect_delimiter()
         
         # 构建 AST 节点
-        children = [ASTNode("COLUMN", col_name + ":" + col_type) for col_name, col_type in columns]
+        # 列、外键、约束的值直接保存为元组，语义分析时无需再拆分字符串
+        children = [ASTNode("COLUMN", (col_name, col_type)) for col_name, col_type in columns]
         
         if primary_keys:
-            children.append(ASTNode("PRIMARY_KEY", ",".join(primary_keys)))
+            children.append(ASTNode("PRIMARY_KEY", tuple(primary_keys)))
             
         for fk in foreign_keys:
-            fk_node = ASTNode("FOREIGN_KEY", f"{fk['column']}:{fk['references_table']}.{fk['references_column']}")
+            fk_node = ASTNode("FOREIGN_KEY", (fk['column'], fk['references_table'], fk['references_column']))
             children.append(fk_node)
             
         for col_name, col_constraints in constraints.items():
             for constraint in col_constraints:
-                children.append(ASTNode("CONSTRAINT", f"{col_name}:{constraint}"))
+                children.append(ASTNode("CONSTRAINT", (col_name, constraint)))
         
         return ASTNode("CREATE_TABLE", table_name, children)
 
@@ -537,9 +511,9 @@ class Parser:
         while True:
             val_token = self.current_token
             # 在触发器上下文中，允许 OLD/NEW 引用
-            if self.in_trigger_context and val_token.lexeme.upper() in ["OLD", "NEW"]:
+            if self.in_trigger_context and val_token.lexeme_upper in ["OLD", "NEW"]:
                 # 解析 OLD.column 或 NEW.column
-                prefix = val_token.lexeme.upper()
+                prefix = val_token.lexeme_upper
                 self.advance()
                 self.expect("DELIMITER", ".")
                 column = self.expect("IDENTIFIER").lexeme
@@ -580,7 +554,7 @@ class Parser:
                 self.advance()
             else:
                 # 解析列表达式（聚合函数、常量或标识符）
-                if self.current_token and self.current_token.lexeme.upper() in ["COUNT", "SUM", "AVG", "MAX", "MIN"]:
+                if self.current_token and self.current_token.lexeme_upper in _AGGREGATE_FUNCTIONS:
                     # 解析聚合函数
                     col_expr = self.parse_aggregate_function()
                 elif self.current_token and self.current_token.type == "CONST":
@@ -592,7 +566,7 @@ class Parser:
                     col_expr = self.parse_expression()
                 
                 # 检查是否有别名 (AS alias)
-                if self.current_token and self.current_token.lexeme.upper() == "AS":
+                if self.current_token and self.current_token.lexeme_upper == "AS":
                     self.advance()  # 跳过 AS
                     alias = self.expect("IDENTIFIER").lexeme
                     columns.append(f"{col_expr} AS {alias}")
@@ -606,30 +580,30 @@ class Parser:
         
         # 可选 INTO 子句（用于存储过程中的变量赋值）
         into_variable = None
-        if self.current_token and self.current_token.lexeme.upper() == "INTO":
+        if self.current_token and self.current_token.lexeme_upper == "INTO":
             self.advance()  # 跳过 INTO
             into_variable = self.expect("IDENTIFIER").lexeme
         
         # 可选 FROM 子句（支持 SELECT 常量的情况）
         from_clause = None
-        if self.current_token and self.current_token.lexeme.upper() == "FROM":
+        if self.current_token and self.current_token.lexeme_upper == "FROM":
             self.expect("KEYWORD", "FROM")
             # 解析 FROM 子句和可能的 JOIN
             from_clause = self.parse_from_clause()
         
         # 可选 WHERE 子句
         where_node = None
-        if self.current_token and self.current_token.lexeme.upper() == "WHERE":
+        if self.current_token and self.current_token.lexeme_upper == "WHERE":
             where_node = self.parse_where()
         
         # 可选 GROUP BY 子句
         group_by_node = None
-        if self.current_token and self.current_token.lexeme.upper() == "GROUP":
+        if self.current_token and self.current_token.lexeme_upper == "GROUP":
             group_by_node = self.parse_group_by()
         
         # 可选 ORDER BY 子句
         order_by_node = None
-        if self.current_token and self.current_token.lexeme.upper() == "ORDER":
+        if self.current_token and self.current_token.lexeme_upper == "ORDER":
             order_by_node = self.parse_order_by()
             
         self.expect_delimiter()
@@ -664,7 +638,7 @@ class Parser:
         alias = None
         if (self.current_token and 
             self.current_token.type == "IDENTIFIER" and 
-            self.current_token.lexeme.upper() not in ["JOIN", "INNER", "LEFT", "RIGHT", "WHERE", "GROUP", "ORDER"]):
+            self.current_token.lexeme_upper not in _FROM_BOUNDARY_KEYWORDS):
             alias = self.current_token.lexeme
             self.advance()
         
@@ -673,7 +647,7 @@ class Parser:
             from_node.children.append(ASTNode("ALIAS", alias))
         
         # 检查是否有 JOIN
-        while self.current_token and self.current_token.lexeme.upper() in ["JOIN", "INNER", "LEFT", "RIGHT"]:
+        while self.current_token and self.current_token.lexeme_upper in _JOIN_START_KEYWORDS:
             join_node = self.parse_join()
             from_node.children.append(join_node)
             
@@ -683,8 +657,8 @@ class Parser:
         """解析 JOIN 子句"""
         join_type = "INNER"  # 默认
         
-        if self.current_token.lexeme.upper() in ["INNER", "LEFT", "RIGHT"]:
-            join_type = self.current_token.lexeme.upper()
+        if self.current_token.lexeme_upper in _JOIN_TYPE_KEYWORDS:
+            join_type = self.current_token.lexeme_upper
             self.advance()
             
         self.expect("KEYWORD", "JOIN")
@@ -694,7 +668,7 @@ class Parser:
         alias = None
         if (self.current_token and 
             self.current_token.type == "IDENTIFIER" and 
-            self.current_token.lexeme.upper() != "ON"):
+            self.current_token.lexeme_upper != "ON"):
             alias = self.current_token.lexeme
             self.advance()
         
@@ -743,8 +717,8 @@ class Parser:
             col_name = self.parse_qualified_identifier()
             direction = "ASC"  # 默认升序
             
-            if self.current_token and self.current_token.lexeme.upper() in ["ASC", "DESC"]:
-                direction = self.current_token.lexeme.upper()
+            if self.current_token and self.current_token.lexeme_upper in ["ASC", "DESC"]:
+                direction = self.current_token.lexeme_upper
                 self.advance()
                 
             columns.append((col_name, direction))
@@ -755,7 +729,7 @@ class Parser:
                 break
                 
         return ASTNode("ORDER_BY", None, [
-            ASTNode("SORT", f"{col}:{direction}") for col, direction in columns
+            ASTNode("SORT", (col, direction)) for col, direction in columns
         ])
 
     def delete(self):
@@ -763,7 +737,7 @@ class Parser:
         self.expect("KEYWORD", "FROM")
         table_name = self.expect("IDENTIFIER").lexeme
         where_node = None
-        if self.current_token and self.current_token.lexeme.upper() == "WHERE":
+        if self.current_token and self.current_token.lexeme_upper == "WHERE":
             where_node = self.parse_where()
         self.expect_delimiter()
         children = []
@@ -801,12 +775,12 @@ class Parser:
         
         # 可选 WHERE 子句
         where_node = None
-        if self.current_token and self.current_token.lexeme.upper() == "WHERE":
+        if self.current_token and self.current_token.lexeme_upper == "WHERE":
             where_node = self.parse_where()
             
         self.expect_delimiter()
         
-        children = [ASTNode("ASSIGNMENT", f"{col}={val}") for col, val in assignments]
+        children = [ASTNode("ASSIGNMENT", (col, val)) for col, val in assignments]
         if where_node:
             children.append(where_node)
             
@@ -866,7 +840,7 @@ class Parser:
         """解析 OR 表达式 (最低优先级)"""
         left = self.parse_and_expression()
         
-        while self.current_token and self.current_token.lexeme.upper() == "OR":
+        while self.current_token and self.current_token.lexeme_upper == "OR":
             self.advance()  # 跳过 OR
             right = self.parse_and_expression()
             left = ASTNode("LOGICAL_OP", "OR", [left, right])
@@ -877,7 +851,7 @@ class Parser:
         """解析 AND 表达式"""
         left = self.parse_not_expression()
         
-        while self.current_token and self.current_token.lexeme.upper() == "AND":
+        while self.current_token and self.current_token.lexeme_upper == "AND":
             self.advance()  # 跳过 AND
             right = self.parse_not_expression()
             left = ASTNode("LOGICAL_OP", "AND", [left, right])
@@ -886,7 +860,7 @@ class Parser:
     
     def parse_not_expression(self):
         """解析 NOT 表达式"""
-        if self.current_token and self.current_token.lexeme.upper() == "NOT":
+        if self.current_token and self.current_token.lexeme_upper == "NOT":
             self.advance()  # 跳过 NOT
             expr = self.parse_comparison_expression()
             return ASTNode("LOGICAL_OP", "NOT", [expr])
@@ -909,11 +883,11 @@ class Parser:
         if not self.current_token:
             raise ParseError("Expected operator after identifier")
             
-        if self.current_token.lexeme.upper() == "BETWEEN":
+        if self.current_token.lexeme_upper == "BETWEEN":
             return self.parse_between_expression(left)
-        elif self.current_token.lexeme.upper() == "IN":
+        elif self.current_token.lexeme_upper == "IN":
             return self.parse_in_expression(left)
-        elif self.current_token.lexeme.upper() == "LIKE":
+        elif self.current_token.lexeme_upper == "LIKE":
             return self.parse_like_expression(left)
         elif self.current_token.type == "OPERATOR":
             return self.parse_simple_comparison(left)
@@ -968,9 +942,9 @@ class Parser:
         elif self.current_token.type == "IDENTIFIER":
             return self.parse_qualified_identifier()
         elif (self.current_token.type == "KEYWORD" and 
-              self.current_token.lexeme.upper() in ["NEW", "OLD"]):
+              self.current_token.lexeme_upper in ["NEW", "OLD"]):
             # 在触发器中，NEW 和 OLD 是特殊的关键字，需要特殊处理
-            prefix = self.current_token.lexeme.upper()
+            prefix = self.current_token.lexeme_upper
             self.advance()
             if self.current_token and self.current_token.lexeme == ".":
                 self.advance()  # 跳过 '.'
@@ -983,7 +957,7 @@ class Parser:
     
     def parse_aggregate_function(self):
         """解析聚合函数 (COUNT, SUM, AVG, MAX, MIN)"""
-        func_name = self.current_token.lexeme.upper()
+        func_name = self.current_token.lexeme_upper
         self.advance()  # 跳过函数名
         
         self.expect("DELIMITER", "(")
@@ -993,14 +967,14 @@ class Parser:
             if self.current_token and self.current_token.lexeme == "*":
                 arg = "*"
                 self.advance()
-            elif self.current_token and self.current_token.lexeme.upper() == "DISTINCT":
+            elif self.current_token and self.current_token.lexeme_upper == "DISTINCT":
                 self.advance()  # 跳过 DISTINCT
                 arg = f"DISTINCT {self.parse_qualified_identifier()}"
             else:
                 arg = self.parse_qualified_identifier()
         else:
             # SUM, AVG, MAX, MIN 只接受列名
-            if self.current_token and self.current_token.lexeme.upper() == "DISTINCT":
+            if self.current_token and self.current_token.lexeme_upper == "DISTINCT":
                 self.advance()  # 跳过 DISTINCT
                 arg = f"DISTINCT {self.parse_qualified_identifier()}"
             else:
@@ -1022,7 +996,7 @@ class Parser:
         """解析 BEGIN TRANSACTION 语句"""
         self.expect("KEYWORD", "BEGIN")
         # TRANSACTION 或 WORK 是可选的
-        if self.current_token and self.current_token.lexeme.upper() in ["TRANSACTION", "WORK"]:
+        if self.current_token and self.current_token.lexeme_upper in ["TRANSACTION", "WORK"]:
             self.advance()
         self.expect_delimiter()
         return ASTNode("BEGIN_TRANSACTION")
@@ -1031,7 +1005,7 @@ class Parser:
         """解析 COMMIT 语句"""
         self.expect("KEYWORD", "COMMIT")
         # WORK 是可选的
-        if self.current_token and self.current_token.lexeme.upper() == "WORK":
+        if self.current_token and self.current_token.lexeme_upper == "WORK":
             self.advance()
         self.expect_delimiter()
         return ASTNode("COMMIT")
@@ -1040,7 +1014,7 @@ class Parser:
         """解析 ROLLBACK 语句"""
         self.expect("KEYWORD", "ROLLBACK")
         # WORK 是可选的
-        if self.current_token and self.current_token.lexeme.upper() == "WORK":
+        if self.current_token and self.current_token.lexeme_upper == "WORK":
             self.advance()
         self.expect_delimiter()
         return ASTNode("ROLLBACK")
@@ -1051,7 +1025,7 @@ class Parser:
         
         # 检查是否是 UNIQUE INDEX
         is_unique = False
-        if self.current_token and self.current_token.lexeme.upper() == "UNIQUE":
+        if self.current_token and self.current_token.lexeme_upper == "UNIQUE":
             is_unique = True
             self.advance()
         
@@ -1075,11 +1049,11 @@ class Parser:
         
         # 可选的 USING 子句（指定索引类型）
         index_type = "BTREE"  # 默认为B+树
-        if self.current_token and self.current_token.lexeme.upper() == "USING":
+        if self.current_token and self.current_token.lexeme_upper == "USING":
             self.advance()
             # 期望索引类型
-            if self.current_token and self.current_token.lexeme.upper() in ["BTREE", "HASH"]:
-                index_type = self.current_token.lexeme.upper()
+            if self.current_token and self.current_token.lexeme_upper in ["BTREE", "HASH"]:
+                index_type = self.current_token.lexeme_upper
                 self.advance()
             else:
                 # 不支持的索引类型，抛出带有上下文的错误
@@ -1089,7 +1063,7 @@ class Parser:
         
         # 可选的 WHERE 子句（部分索引）
         where_condition = None
-        if self.current_token and self.current_token.lexeme.upper() == "WHERE":
+        if self.current_token and self.current_token.lexeme_upper == "WHERE":
             where_condition = self.parse_where()
         
         self.expect_delimiter()
@@ -1097,7 +1071,7 @@ class Parser:
         # 构建 AST 节点
         index_node = ASTNode("CREATE_INDEX", index_name)
         index_node.children.append(ASTNode("TABLE", table_name))
-        index_node.children.append(ASTNode("COLUMNS", ",".join(columns)))
+        index_node.children.append(ASTNode("COLUMNS", tuple(columns)))
         index_node.children.append(ASTNode("TYPE", index_type))
         if is_unique:
             index_node.children.append(ASTNode("UNIQUE", "TRUE"))
@@ -1114,7 +1088,7 @@ class Parser:
         
         # 可选的 ON table_name
         table_name = None
-        if self.current_token and self.current_token.lexeme.upper() == "ON":
+        if self.current_token and self.current_token.lexeme_upper == "ON":
             self.advance()
             table_name = self.expect("IDENTIFIER").lexeme
         
@@ -1134,10 +1108,10 @@ class Parser:
         
         # 触发时机: BEFORE | AFTER | INSTEAD OF
         timing = None
-        if self.current_token and self.current_token.lexeme.upper() in ["BEFORE", "AFTER"]:
-            timing = self.current_token.lexeme.upper()
+        if self.current_token and self.current_token.lexeme_upper in ["BEFORE", "AFTER"]:
+            timing = self.current_token.lexeme_upper
             self.advance()
-        elif self.current_token and self.current_token.lexeme.upper() == "INSTEAD":
+        elif self.current_token and self.current_token.lexeme_upper == "INSTEAD":
             timing = "INSTEAD"
             self.advance()
             self.expect("KEYWORD", "OF")
@@ -1148,12 +1122,12 @@ class Parser:
         # 触发事件: INSERT | UPDATE | DELETE
         events = []
         while True:
-            if self.current_token and self.current_token.lexeme.upper() in ["INSERT", "UPDATE", "DELETE"]:
-                events.append(self.current_token.lexeme.upper())
+            if self.current_token and self.current_token.lexeme_upper in _TRIGGER_EVENT_KEYWORDS:
+                events.append(self.current_token.lexeme_upper)
                 self.advance()
                 
                 # 检查是否有 OR 连接多个事件
-                if self.current_token and self.current_token.lexeme.upper() == "OR":
+                if self.current_token and self.current_token.lexeme_upper == "OR":
                     self.advance()
                     continue
                 else:
@@ -1170,7 +1144,7 @@ class Parser:
         
         # 可选的 FOR EACH ROW
         for_each_row = False
-        if self.current_token and self.current_token.lexeme.upper() == "FOR":
+        if self.current_token and self.current_token.lexeme_upper == "FOR":
             self.advance()
             self.expect("KEYWORD", "EACH")
             self.expect("KEYWORD", "ROW")
@@ -1178,7 +1152,7 @@ class Parser:
         
         # 可选的 WHEN 条件
         when_condition = None
-        if self.current_token and self.current_token.lexeme.upper() == "WHEN":
+        if self.current_token and self.current_token.lexeme_upper == "WHEN":
             self.advance()
             # 解析条件表达式
             when_condition = self.parse_trigger_condition()
@@ -1188,7 +1162,7 @@ class Parser:
         
         # 防御性同步：如果此时仍然停留在 END（极端情况下主体未消费），则手动消费 END 和其后分号
         consumed_end = False
-        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.lexeme.upper() == "END":
+        if self.current_token and self.current_token.type == "KEYWORD" and self.current_token.lexeme_upper == "END":
             self.advance()
             if self.current_token and self.current_token.type == "DELIMITER" and self.current_token.lexeme == ";":
                 self.advance()
@@ -1201,7 +1175,7 @@ class Parser:
         # 构建 AST 节点
         trigger_node = ASTNode("CREATE_TRIGGER", trigger_name)
         trigger_node.children.append(ASTNode("TIMING", timing))
-        trigger_node.children.append(ASTNode("EVENTS", ",".join(events)))
+        trigger_node.children.append(ASTNode("EVENTS", tuple(events)))
         trigger_node.children.append(ASTNode("TABLE", table_name))
         trigger_node.children.append(ASTNode("FOR_EACH_ROW", str(for_each_row)))
         
@@ -1220,7 +1194,7 @@ class Parser:
         
         # 可选的 ON table_name
         table_name = None
-        if self.current_token and self.current_token.lexeme.upper() == "ON":
+        if self.current_token and self.current_token.lexeme_upper == "ON":
             self.advance()
             table_name = self.expect("IDENTIFIER").lexeme
         
@@ -1241,7 +1215,7 @@ class Parser:
         """解析触发器 OR 表达式"""
         left = self.parse_trigger_and_expression()
         
-        while self.current_token and self.current_token.lexeme.upper() == "OR":
+        while self.current_token and self.current_token.lexeme_upper == "OR":
             self.advance()  # 跳过 OR
             right = self.parse_trigger_and_expression()
             left = ASTNode("LOGICAL_OP", "OR", [left, right])
@@ -1252,7 +1226,7 @@ class Parser:
         """解析触发器 AND 表达式"""
         left = self.parse_trigger_comparison()
         
-        while self.current_token and self.current_token.lexeme.upper() == "AND":
+        while self.current_token and self.current_token.lexeme_upper == "AND":
             self.advance()  # 跳过 AND
             right = self.parse_trigger_comparison()
             left = ASTNode("LOGICAL_OP", "AND", [left, right])
@@ -1274,8 +1248,8 @@ class Parser:
     
     def parse_trigger_operand(self):
         """解析触发器操作数（支持 OLD.column, NEW.column）"""
-        if self.current_token and self.current_token.lexeme.upper() in ["OLD", "NEW"]:
-            prefix = self.current_token.lexeme.upper()
+        if self.current_token and self.current_token.lexeme_upper in ["OLD", "NEW"]:
+            prefix = self.current_token.lexeme_upper
             self.advance()
             self.expect("DELIMITER", ".")
             column = self.expect("IDENTIFIER").lexeme
@@ -1293,12 +1267,12 @@ class Parser:
     
     def parse_trigger_body(self):
         """解析触发器主体"""
-        if self.current_token and self.current_token.lexeme.upper() == "BEGIN":
+        if self.current_token and self.current_token.lexeme_upper == "BEGIN":
             # BEGIN ... END 块
             self.advance()
             statements = []
             
-            while self.current_token and self.current_token.lexeme.upper() != "END":
+            while self.current_token and self.current_token.lexeme_upper != "END":
                 # 解析触发器内部的语句
                 stmt = self.parse_trigger_statement()
                 statements.append(stmt)
@@ -1329,11 +1303,11 @@ class Parser:
         
         try:
             # 简化版本：支持基本的 INSERT, UPDATE, DELETE 语句
-            if self.current_token and self.current_token.lexeme.upper() == "INSERT":
+            if self.current_token and self.current_token.lexeme_upper == "INSERT":
                 return self.insert()
-            elif self.current_token and self.current_token.lexeme.upper() == "UPDATE":
+            elif self.current_token and self.current_token.lexeme_upper == "UPDATE":
                 return self.update()
-            elif self.current_token and self.current_token.lexeme.upper() == "DELETE":
+            elif self.current_token and self.current_token.lexeme_upper == "DELETE":
                 return self.delete()
             else:
                 # 其他语句类型（如变量赋值等）暂时作为通用语句处理
@@ -1357,7 +1331,7 @@ class Parser:
         
         # 检查是否是物化视图
         is_materialized = False
-        if self.current_token and self.current_token.lexeme.upper() == "MATERIALIZED":
+        if self.current_token and self.current_token.lexeme_upper == "MATERIALIZED":
             is_materialized = True
             self.advance()
         
@@ -1386,7 +1360,7 @@ class Parser:
         view_node = ASTNode("CREATE_VIEW", view_name)
         view_node.children.append(ASTNode("MATERIALIZED", str(is_materialized)))
         if columns:
-            view_node.children.append(ASTNode("COLUMNS", ",".join(columns)))
+            view_node.children.append(ASTNode("COLUMNS", tuple(columns)))
         view_node.children.append(ASTNode("QUERY", None, [view_query]))
         
         return view_node
@@ -1398,7 +1372,7 @@ class Parser:
         
         # 可选的 IF EXISTS
         if_exists = False
-        if self.current_token and self.current_token.lexeme.upper() == "IF":
+        if self.current_token and self.current_token.lexeme_upper == "IF":
             self.advance()
             self.expect("KEYWORD", "EXISTS")
             if_exists = True
@@ -1407,8 +1381,8 @@ class Parser:
         
         # 可选的 CASCADE/RESTRICT
         drop_behavior = None
-        if self.current_token and self.current_token.lexeme.upper() in ["CASCADE", "RESTRICT"]:
-            drop_behavior = self.current_token.lexeme.upper()
+        if self.current_token and self.current_token.lexeme_upper in ["CASCADE", "RESTRICT"]:
+            drop_behavior = self.current_token.lexeme_upper
             self.advance()
         
         self.expect_delimiter()
@@ -1426,7 +1400,7 @@ class Parser:
         self.expect("KEYWORD", "CREATE")
         
         # 判断是 PROCEDURE 还是 FUNCTION
-        proc_type = self.current_token.lexeme.upper()
+        proc_type = self.current_token.lexeme_upper
         is_function = proc_type == "FUNCTION"
         self.expect("KEYWORD", proc_type)
         
@@ -1440,8 +1414,8 @@ class Parser:
             while self.current_token and self.current_token.lexeme != ")":
                 # 解析参数模式 (IN/OUT/INOUT，可选)
                 param_mode = "IN"  # 默认为 IN
-                if self.current_token and self.current_token.lexeme.upper() in ["IN", "OUT", "INOUT"]:
-                    param_mode = self.current_token.lexeme.upper()
+                if self.current_token and self.current_token.lexeme_upper in _PARAMETER_MODE_KEYWORDS:
+                    param_mode = self.current_token.lexeme_upper
                     self.advance()
                 
                 # 参数名
@@ -1471,7 +1445,7 @@ class Parser:
         
         # 解析过程体内的语句
         body_statements = []
-        while self.current_token and self.current_token.lexeme.upper() != "END":
+        while self.current_token and self.current_token.lexeme_upper != "END":
             stmt = self.parse_procedure_statement()
             if stmt:
                 body_statements.append(stmt)
@@ -1506,13 +1480,13 @@ class Parser:
         """解析 DROP PROCEDURE 或 DROP FUNCTION 语句"""
         self.expect("KEYWORD", "DROP")
         
-        proc_type = self.current_token.lexeme.upper()
+        proc_type = self.current_token.lexeme_upper
         is_function = proc_type == "FUNCTION"
         self.expect("KEYWORD", proc_type)
         
         # 可选的 IF EXISTS
         if_exists = False
-        if self.current_token and self.current_token.lexeme.upper() == "IF":
+        if self.current_token and self.current_token.lexeme_upper == "IF":
             self.advance()
             self.expect("KEYWORD", "EXISTS")
             if_exists = True
@@ -1561,7 +1535,7 @@ class Parser:
         # 构建 AST 节点
         call_node = ASTNode("CALL_PROCEDURE", proc_name)
         if arguments:
-            args_node = ASTNode("ARGUMENTS", ",".join(arguments))
+            args_node = ASTNode("ARGUMENTS", tuple(arguments))
             call_node.children.append(args_node)
         
         return call_node
@@ -1571,7 +1545,7 @@ class Parser:
         if not self.current_token:
             return None
         
-        stmt_type = self.current_token.lexeme.upper()
+        stmt_type = self.current_token.lexeme_upper
         
         # 控制流语句
         if stmt_type == "IF":
@@ -1605,7 +1579,7 @@ class Parser:
         # 解析 IF 分支的语句
         if_statements = []
         while (self.current_token and 
-               self.current_token.lexeme.upper() not in ["ELSEIF", "ELSE", "END"]):
+               self.current_token.lexeme_upper not in _IF_BRANCH_END_KEYWORDS):
             stmt = self.parse_procedure_statement()
             if stmt:
                 if_statements.append(stmt)
@@ -1614,23 +1588,23 @@ class Parser:
         elseif_branches = []
         else_statements = []
         
-        while self.current_token and self.current_token.lexeme.upper() == "ELSEIF":
+        while self.current_token and self.current_token.lexeme_upper == "ELSEIF":
             self.advance()  # 跳过 ELSEIF
             elseif_condition = self.parse_condition()
             self.expect("KEYWORD", "THEN")
             
             elseif_stmts = []
             while (self.current_token and 
-                   self.current_token.lexeme.upper() not in ["ELSEIF", "ELSE", "END"]):
+                   self.current_token.lexeme_upper not in _IF_BRANCH_END_KEYWORDS):
                 stmt = self.parse_procedure_statement()
                 if stmt:
                     elseif_stmts.append(stmt)
             
             elseif_branches.append((elseif_condition, elseif_stmts))
         
-        if self.current_token and self.current_token.lexeme.upper() == "ELSE":
+        if self.current_token and self.current_token.lexeme_upper == "ELSE":
             self.advance()  # 跳过 ELSE
-            while self.current_token and self.current_token.lexeme.upper() != "END":
+            while self.current_token and self.current_token.lexeme_upper != "END":
                 stmt = self.parse_procedure_statement()
                 if stmt:
                     else_statements.append(stmt)
@@ -1674,7 +1648,7 @@ class Parser:
         
         # 解析循环体
         loop_statements = []
-        while self.current_token and self.current_token.lexeme.upper() != "END":
+        while self.current_token and self.current_token.lexeme_upper != "END":
             stmt = self.parse_procedure_statement()
             if stmt:
                 loop_statements.append(stmt)
@@ -1701,7 +1675,7 @@ class Parser:
         
         # 可选的默认值
         default_value = None
-        if self.current_token and self.current_token.lexeme.upper() == "DEFAULT":
+        if self.current_token and self.current_token.lexeme_upper == "DEFAULT":
             self.advance()
             if self.current_token.type in ["CONST", "IDENTIFIER"]:
                 default_value = self.current_token.lexeme
@@ -1810,6 +1784,39 @@ class Parser:
             raise ParseError(f"Unexpected token in expression: {self.current_token.lexeme}", 
                            self.current_token.line, self.current_token.column)
 
+    # 语句首关键字 -> 解析方法（CREATE/DROP 见下面的二级分派表）
+    _STATEMENT_DISPATCH = {
+        "INSERT": insert,
+        "SELECT": select,
+        "UPDATE": update,
+        "DELETE": delete,
+        "BEGIN": begin_transaction,
+        "COMMIT": commit,
+        "ROLLBACK": rollback,
+        "CALL": call_procedure,
+    }
+    # CREATE 之后的关键字 -> 解析方法
+    _CREATE_DISPATCH = {
+        "INDEX": create_index,
+        "TRIGGER": create_trigger,
+        "VIEW": create_view,
+        "PROCEDURE": create_procedure,
+        "FUNCTION": create_procedure,
+    }
+    # CREATE <修饰词> <对象>：修饰词 -> (对象关键字, 解析方法)
+    _CREATE_MODIFIERS = {
+        "UNIQUE": ("INDEX", create_index),
+        "MATERIALIZED": ("VIEW", create_view),
+    }
+    # DROP 之后的关键字 -> 解析方法
+    _DROP_DISPATCH = {
+        "INDEX": drop_index,
+        "TRIGGER": drop_trigger,
+        "VIEW": drop_view,
+        "PROCEDURE": drop_procedure,
+        "FUNCTION": drop_procedure,
+    }
+
 # 测试
 if __name__ == "__main__":
     sql_text = """
@@ -0,0 +1,180 @@
+"""
+语义分析测试
+"""
+import pickle
+import unittest
+from modules.sql_compiler.lexical.lexer import Lexer
+from modules.sql_compiler.syntax.parser import Parser, ASTNode
+from modules.sql_compiler.semantic.semantic import SemanticAnalyzer, Catalog, SemanticError
+
+
+def parse_sql(sql_text):
+    tokens, errors = Lexer(sql_text).tokenize()
+    assert not errors
+    return Parser(tokens).parse()
+
+
+class TestSemanticAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.catalog = Catalog()
+        self.analyzer = SemanticAnalyzer(self.catalog)
+
+    def analyze(self, sql_text):
+        for ast in parse_sql(sql_text):
+            self.analyzer.analyze(ast)
+
+    def test_drop_referenced_table_rejected(self):
+        """被外键引用的表不能删除，引用方删除后可以删除"""
+        self.analyze("""
+            CREATE TABLE a(id INT PRIMARY KEY);
+            CREATE TABLE b(id INT, aid INT, FOREIGN KEY (aid) REFERENCES a(id));
+        """)
+        with self.assertRaises(SemanticError) as ctx:
+            self.analyze("DROP TABLE a;")
+        self.assertEqual(ctx.exception.error_type, "ForeignKeyError")
+
+        self.analyze("DROP TABLE b; DROP TABLE a;")
+        self.assertFalse(self.catalog.has_table("a"))
+        self.assertEqual(self.catalog.get_referencing_foreign_keys("a"), [])
+
+    def test_self_reference_does_not_block_drop(self):
+        """自引用外键不阻止删除表本身"""
+        self.analyze("CREATE TABLE node(id INT, parent INT);")
+        self.catalog.add_foreign_key("node", "parent", "node", "id")
+        self.analyze("DROP TABLE node;")
+        self.assertFalse(self.catalog.has_table("node"))
+
+    def test_create_index_rejects_duplicate_columns(self):
+        """CREATE INDEX 中重复的列名应报错"""
+        self.analyze("CREATE TABLE t(a INT, b INT);")
+        self.analyze("CREATE INDEX idx_ab ON t(a, b);")
+        with self.assertRaises(SemanticError) as ctx:
+            self.analyze("CREATE INDEX idx_aa ON t(a, a);")
+        self.assertEqual(ctx.exception.error_type, "IndexError")
+
+    def test_schema_change_reflected_in_checks(self):
+        """重复语句结果一致，目录变更后按新的目录重新检查"""
+        self.analyze("CREATE TABLE t(a INT);")
+        self.analyze("SELECT a FROM t;")
+        self.analyze("SELECT a FROM t;")
+
+        # 绕过分析器直接修改目录，同样要让之前通过的语句重新检查
+        self.catalog.drop_table("t")
+        with self.assertRaises(SemanticError) as ctx:
+            self.analyze("SELECT a FROM t;")
+        self.assertEqual(ctx.exception.error_type, "TableError")
+
+        self.catalog.create_table("t", {"a": "INT"})
+        self.analyze("SELECT a FROM t;")
+
+    def test_error_context_is_lazy(self):
+        """SemanticError 的可用表/列上下文在访问时才计算"""
+        calls = []
+
+        def tables():
+            calls.append("tables")
+            return ["t"]
+
+        err = SemanticError("TableError", "x", "表不存在", available_tables=tables)
+        self.assertEqual(calls, [])
+        self.assertEqual(err.available_tables, ["t"])
+        self.assertEqual(err.available_tables, ["t"])
+        self.assertEqual(calls, ["tables"])
+
+        self.analyze("CREATE TABLE t(a INT);")
+        with self.assertRaises(SemanticError) as ctx:
+            self.analyze("INSERT INTO missing (a) VALUES (1);")
+        self.assertEqual(ctx.exception.available_tables, ["t"])
+        self.assertEqual(ctx.exception.available_columns, {"t": ["a"]})
+
+    def test_error_pickle_round_trip(self):
+        """带消息模板参数和分析器弱引用的 SemanticError 可以序列化"""
+        err = SemanticError("TypeError", "a", "期望 INT, 但得到 {}", analyzer=self.analyzer,
+                            message_args=("x",))
+        restored = pickle.loads(pickle.dumps(err))
+        self.assertEqual(restored.error_type, "TypeError")
+        self.assertEqual(restored.position, "a")
+        self.assertEqual(restored.message, "期望 INT, 但得到 x")
+        self.assertEqual(str(restored), str(err))
+
+    def test_insert_int_accepts_signed_literal(self):
+        """INT 列接受带符号整数（与 WHERE 相同的符号规则），拒绝小数"""
+        self.analyze("CREATE TABLE t(a INT);")
+        self.analyzer.analyze(ASTNode("INSERT", "t", [ASTNode("COLUMN", "a"), ASTNode("VALUE", "-5")]))
+        self.analyzer.analyze(ASTNode("INSERT", "t", [ASTNode("COLUMN", "a"), ASTNode("VALUE", "+5")]))
+        with self.assertRaises(SemanticError):
+            self.analyze("INSERT INTO t (a) VALUES (1.);")
+        with self.assertRaises(SemanticError) as ctx:
+            self.analyzer.analyze(ASTNode("INSERT", "t", [ASTNode("COLUMN", "a"), ASTNode("VALUE", "1.5")]))
+        self.assertEqual(ctx.exception.error_type, "TypeError")
+        self.assertEqual(ctx.exception.message, "期望 INT, 但得到 1.5")
+
+    def test_where_numeric_literal(self):
+        """WHERE 中 INT 列接受带符号数和 "1." 这类词法合法的数字，拒绝 "1.2.3" 这类多小数点的值"""
+        self.analyze("CREATE TABLE t(a INT);")
+
+        def delete_where(value):
+            where = ASTNode("WHERE", None, [ASTNode("LEFT", "a"), ASTNode("OP", "="), ASTNode("RIGHT", value)])
+            self.analyzer.analyze(ASTNode("DELETE", "t", [where]))
+
+        delete_where("-5")
+        delete_where("2.5")
+        delete_where("+5")
+        self.analyze("DELETE FROM t WHERE a = 1.;")
+        with self.assertRaises(SemanticError) as ctx:
+            delete_where("1.2.3")
+        self.assertEqual(ctx.exception.error_type, "TypeError")
+
+    def test_procedure_scope_restored(self):
+        """存储过程定义结束后，参数和局部变量不会泄漏到外层作用域"""
+        self.analyze("CREATE TABLE t(a INT);")
+        self.analyze("CREATE PROCEDURE p(IN x INT) BEGIN DECLARE y INT; SET y = x; END;")
+        self.assertFalse(self.analyzer.current_procedure_params)
+        self.assertFalse(self.analyzer.current_local_vars)
+        self.assertTrue(self.catalog.has_procedure("p"))
+
+    def test_update_value_containing_equals(self):
+        """UPDATE 赋值的字符串值中可以包含等号"""
+        self.analyze("CREATE TABLE t(a INT, b VARCHAR);")
+        self.analyze("UPDATE t SET b = 'x=y' WHERE a = 1;")
+
+    def test_insert_checks_unresolved_foreign_key(self):
+        """事后添加的、引用不存在表的外键在 INSERT 时报错"""
+        self.analyze("CREATE TABLE a(id INT PRIMARY KEY);")
+        self.analyze("CREATE TABLE b(id INT, aid INT, FOREIGN KEY (aid) REFERENCES a(id));")
+        self.analyze("INSERT INTO b (id, aid) VALUES (1, 1);")
+
+        self.catalog.add_foreign_key("b", "id", "missing", "id")
+        with self.assertRaises(SemanticError) as ctx:
+            self.analyze("INSERT INTO b (id, aid) VALUES (2, 1);")
+        self.assertEqual(ctx.exception.error_type, "ForeignKeyError")
+
+    def test_verbose_logs_check_progress(self):
+        """verbose 分析器以 INFO 级别输出检查过程信息"""
+        analyzer = SemanticAnalyzer(self.catalog, verbose=True)
+        with self.assertLogs("modules.sql_compiler.semantic.semantic", level="INFO") as logs:
+            for ast in parse_sql("CREATE TABLE t(a INT);"):
+                analyzer.analyze(ast)
+        self.assertIn("[OK] CREATE TABLE t 语义检查通过", logs.output[0])
+
+    def test_alias_shadowing_joined_table_name(self):
+        """别名与参与 JOIN 的表同名时，限定列名仍可按实际表解析"""
+        self.analyze("CREATE TABLE a(id INT, x INT); CREATE TABLE b(id INT, y INT);")
+        self.analyze("SELECT x FROM a b JOIN b c ON b.y = c.id WHERE b.y = 1;")
+        with self.assertRaises(SemanticError) as ctx:
+            self.analyze("SELECT x FROM a b JOIN b c ON b.z = c.id;")
+        self.assertEqual(ctx.exception.error_type, "ColumnError")
+
+    def test_deeply_nested_where_condition(self):
+        """深层嵌套的 AND/OR 条件不会触发递归深度限制"""
+        self.analyze("CREATE TABLE t(a INT);")
+        condition = ASTNode("COMPARISON", None, [ASTNode("LEFT", "a"), ASTNode("OP", "="), ASTNode("RIGHT", "1")])
+        for _ in range(5000):
+            other = ASTNode("COMPARISON", None, [ASTNode("LEFT", "a"), ASTNode("OP", "="), ASTNode("RIGHT", "2")])
+            condition = ASTNode("LOGICAL_OP", "OR", [condition, other])
+        select = ASTNode("SELECT", None, [ASTNode("COLUMN", "a"), ASTNode("FROM", "t"), ASTNode("WHERE", None, [condition])])
+        self.analyzer.analyze(select)
+
+
+if __name__ == "__main__":
+    unittest.main()